@@ -1,11 +1,17 @@
 """Convenience runner for the Buffett/Lynch 2.0 backtest using Yahoo Finance data."""
 from __future__ import annotations
 
+import csv
+import functools
+from concurrent.futures import ThreadPoolExecutor
 import os
+import pickle
+import threading
 from datetime import datetime
 import hashlib
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, TypeVar
 
 import numpy as np
 import pandas as pd
@@ -17,26 +23,95 @@ from buffett_lynch.currency_engine import CurrencyEngine
 from buffett_lynch.data_loader import DataLoader, InMemorySource
 from buffett_lynch.execution_engine import ExecutionEngine
 from buffett_lynch.finnhub_fundamentals import FinnhubFundamentalsSource
-from buffett_lynch.fundamental_scoring import (
-    FundamentalScorer,
-    ScoringRules,
-    growth_score,
-    moat_score,
-    quality_score,
-)
-from buffett_lynch.models import FundamentalSnapshot, PriceBar
+from buffett_lynch.fundamental_scoring import FundamentalScorer, make_scorer
+from buffett_lynch.models import FundamentalSnapshot, PriceBar, ScoredCompany
 from buffett_lynch.portfolio_manager import PortfolioManager
 from buffett_lynch.universe_builder import UniverseBuilder
 
+T = TypeVar("T")
 
-def _price_series(symbol: str, start_date: str, end_date: str) -> List[PriceBar]:
-    """Download price history for a symbol with a deterministic fallback."""
-    df = yf.download(symbol, start=start_date, end=end_date, auto_adjust=True, progress=False)
+DEFAULT_CACHE_DIR = Path("reports/cache")
+
+
+def _cache_dir() -> Optional[Path]:
+    """Return the on-disk cache directory, or ``None`` when caching is disabled.
+
+    ``BL_CACHE_DIR`` overrides the location and ``BL_NO_CACHE`` (set by
+    ``src/main.py --no-cache``) bypasses the cache entirely.
+    """
+    if os.environ.get("BL_NO_CACHE"):
+        return None
+    return Path(os.environ.get("BL_CACHE_DIR") or DEFAULT_CACHE_DIR)
+
+
+# Set by helpers that filled in synthetic data for this call; such results are not persisted
+_FALLBACK = threading.local()
+
+
+def _mark_fallback() -> None:
+    """Keep the current ``_disk_cache`` result out of the cache.
+
+    Fallback data usually means a transient Yahoo failure; caching it would
+    replay synthetic values on every later run with the same arguments.
+    """
+    _FALLBACK.used = True
+
+
+def _disk_cache(func: Callable[..., T]) -> Callable[..., T]:
+    """Persist results of deterministic Yahoo Finance helpers keyed by their arguments.
+
+    Results built with fallback data (see :func:`_mark_fallback`) are returned but not stored.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs) -> T:
+        cache_dir = _cache_dir()
+        if cache_dir is None:
+            return func(*args, **kwargs)
+
+        key = hashlib.sha256(repr((func.__name__, args, sorted(kwargs.items()))).encode()).hexdigest()
+        path = cache_dir / f"{key}.pkl"
+        if path.exists():
+            try:
+                return pickle.loads(path.read_bytes())
+            except (pickle.UnpicklingError, EOFError, AttributeError):
+                path.unlink(missing_ok=True)
+
+        _FALLBACK.used = False
+        result = func(*args, **kwargs)
+        if _FALLBACK.used:
+            return result
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp_path, path)
+        return result
+
+    return wrapper
+
+
+def _fallback_prices(start_date: str, end_date: str) -> pd.Series:
+    """Deterministic business-day price path used when Yahoo returns nothing."""
+    dates = pd.date_range(start=start_date, end=end_date, freq="B")
+    return pd.Series(np.linspace(100, 120, len(dates)), index=dates)
+
+
+def _close_prices(df: pd.DataFrame, symbol: str) -> Optional[pd.Series]:
+    """Extract the close series for ``symbol`` from a (possibly multi-ticker) download."""
     if df.empty:
-        dates = pd.date_range(start=start_date, end=end_date, freq="B")
-        prices = pd.Series(np.linspace(100, 120, len(dates)), index=dates)
-    else:
-        prices = df["Close"]
+        return None
+
+    frame = df
+    if isinstance(df.columns, pd.MultiIndex):
+        if symbol in df.columns.get_level_values(0):
+            frame = df[symbol]
+        elif symbol in df.columns.get_level_values(-1):
+            frame = df.xs(symbol, axis=1, level=-1)
+        else:
+            return None
+    if "Close" not in frame.columns:
+        return None
+    prices = frame["Close"]
 
     # yfinance can return a DataFrame for `Close` when column indices carry ticker labels;
     # convert to a single Series before iterating to avoid interpreting ticker names as dates.
@@ -47,9 +122,76 @@ def _price_series(symbol: str, start_date: str, end_date: str) -> List[PriceBar]
             col = symbol if symbol in prices.columns else prices.columns[0]
             prices = prices[col]
 
-    return [PriceBar(pd.to_datetime(date).strftime("%Y-%m-%d"), float(price)) for date, price in prices.items()]
+    # A batched download aligns every ticker on the union of trading days.
+    prices = prices.dropna()
+    return None if prices.empty else prices
 
 
+PRICE_COLUMNS = ["symbol", "date", "close"]
+
+
+@_disk_cache
+def _price_frame(symbols: List[str], start_date: str, end_date: str) -> pd.DataFrame:
+    """Download price histories for all symbols in a single request.
+
+    Returns a tidy frame with one ``symbol, date, close`` row per trading day.
+    Symbols missing from the response fall back to the deterministic series so
+    the backtest can still run offline or when Yahoo drops a ticker.
+    """
+    df = yf.download(
+        tickers=symbols,
+        start=start_date,
+        end=end_date,
+        auto_adjust=True,
+        progress=False,
+        group_by="ticker",
+        threads=True,
+    )
+    frames: List[pd.DataFrame] = []
+    for symbol in symbols:
+        prices = _close_prices(df, symbol)
+        if prices is None:
+            prices = _fallback_prices(start_date, end_date)
+            _mark_fallback()
+        frames.append(
+            pd.DataFrame(
+                {
+                    "symbol": symbol,
+                    "date": pd.DatetimeIndex(prices.index).strftime("%Y-%m-%d"),
+                    "close": prices.to_numpy(dtype=np.float64),
+                }
+            )
+        )
+    if not frames:
+        return pd.DataFrame(columns=PRICE_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _price_bars(prices: pd.DataFrame) -> Dict[str, List[PriceBar]]:
+    """Adapt a tidy price frame to the ``PriceBar`` lists consumed by ``Backtester.run``."""
+    history: Dict[str, List[PriceBar]] = {}
+    for symbol, group in prices.groupby("symbol", sort=False):
+        history[symbol] = list(map(PriceBar, group["date"].tolist(), group["close"].tolist()))
+    return history
+
+
+def _price_series_batch(symbols: List[str], start_date: str, end_date: str) -> Dict[str, List[PriceBar]]:
+    """Download price histories for all symbols as ``PriceBar`` lists."""
+    return _price_bars(_price_frame(symbols, start_date, end_date))
+
+
+def _price_series(symbol: str, start_date: str, end_date: str) -> List[PriceBar]:
+    """Download price history for a symbol with a deterministic fallback."""
+    return _price_series_batch([symbol], start_date, end_date).get(symbol, [])
+
+
+@functools.lru_cache(maxsize=None)
+def _ticker_info(symbol: str) -> dict:
+    """Return Yahoo's (slow, scraped) ``info`` payload for a symbol, memoized per process."""
+    return yf.Ticker(symbol).info or {}
+
+
+@_disk_cache
 def _fundamentals(symbols: List[str], start_year: int, end_year: int) -> Dict[str, List[FundamentalSnapshot]]:
     """Synthesize fundamental snapshots with moat-ready raw inputs.
 
@@ -59,17 +201,25 @@ def _fundamentals(symbols: List[str], start_year: int, end_year: int) -> Dict[st
     the raw inputs (gross margin %, R&D/Sales %, ROIC trend proxy, etc.).
     """
 
+    # The jitter bucket only depends on the symbol, so hash each one once up front
+    buckets = {symbol: hashlib.sha256(symbol.encode()).digest()[0] % 5 for symbol in symbols}
+
     def _with_jitter(base: float, symbol: str, scale: float = 0.02) -> float:
         """Deterministically vary fallback values so percentiles are meaningful."""
 
-        digest = hashlib.sha256(symbol.encode()).digest()
-        bucket = digest[0] % 5
-        return base * (1 + bucket * scale)
+        return base * (1 + buckets[symbol] * scale)
+
+    # Each ``info`` lookup is a separate HTTP scrape; fetch them concurrently
+    with ThreadPoolExecutor(max_workers=min(16, len(symbols) or 1)) as pool:
+        infos = dict(zip(symbols, pool.map(_ticker_info, symbols)))
 
     raw_metrics: Dict[str, Dict[str, float]] = {}
     meta: Dict[str, Dict[str, float]] = {}
     for symbol in symbols:
-        info = yf.Ticker(symbol).info or {}
+        info = infos[symbol]
+        if not info:
+            # An empty payload is a failed scrape rather than sparse metadata
+            _mark_fallback()
         market_cap = float(info.get("marketCap") or 1e10)
         sector = info.get("sector") or "Unknown"
         roe = float(info.get("returnOnEquity") or 15.0)
@@ -116,20 +266,35 @@ def _fundamentals(symbols: List[str], start_year: int, end_year: int) -> Dict[st
         }
         meta[symbol] = {"market_cap": market_cap, "sector": sector}
 
+    # Yearly snapshots share one metrics dict per symbol; enrichment downstream copies before writing.
     fundamentals: Dict[str, List[FundamentalSnapshot]] = {}
     for symbol, metrics in raw_metrics.items():
-        for year in range(start_year, end_year + 1):
-            fundamentals.setdefault(symbol, []).append(
-                FundamentalSnapshot(
-                    period=str(year),
-                    market_cap=meta[symbol]["market_cap"],
-                    sector=meta[symbol]["sector"],
-                    metrics=dict(metrics),
-                )
-            )
+        market_cap = meta[symbol]["market_cap"]
+        sector = meta[symbol]["sector"]
+        fundamentals[symbol] = [
+            FundamentalSnapshot(period=str(year), market_cap=market_cap, sector=sector, metrics=metrics)
+            for year in range(start_year, end_year + 1)
+        ]
     return fundamentals
 
 
+def _score_fundamentals(
+    loader: DataLoader, scorer: FundamentalScorer, symbols: List[str]
+) -> Dict[str, List[ScoredCompany]]:
+    def score(symbol: str) -> List[ScoredCompany]:
+        return scorer.score_batch(symbol, loader.load_fundamentals(symbol))
+
+    if not symbols:
+        return {}
+    # The first load builds the loader's universe-wide enrichment; racing it would rebuild it per thread
+    scored = {symbols[0]: score(symbols[0])}
+    rest = symbols[1:]
+    # Later loads may still hit Finnhub per symbol, so fan out across threads
+    with ThreadPoolExecutor(max_workers=min(32, len(rest) or 1)) as pool:
+        scored.update(zip(rest, pool.map(score, rest)))
+    return scored
+
+
 def run_backtest(start_date: str, end_date: str, initial_capital: float, base_currency: str = "PLN"):
     """Fetch data, run the Buffett/Lynch backtest, and write an equity curve to reports/."""
     Path("reports").mkdir(exist_ok=True)
@@ -148,7 +313,8 @@ def run_backtest(start_date: str, end_date: str, initial_capital: float, base_cu
     else:
         fundamentals_raw = _fundamentals(tickers, start_year, end_year)
 
-    membership = {"SP500": {str(year): tickers for year in range(start_year, end_year + 1)}}
+    years = [str(year) for year in range(start_year, end_year + 1)]
+    membership = {"SP500": dict.fromkeys(years, tickers)}
 
     strategy_cfg = StrategyConfig(
         backtest=BacktestConfig(
@@ -162,26 +328,16 @@ def run_backtest(start_date: str, end_date: str, initial_capital: float, base_cu
     bear_symbol, bear_currency = execution.bear_asset(strategy_cfg.backtest.base_currency)
     bear_tickers = [bear_symbol]
 
-    price_history: Dict[str, List[PriceBar]] = {
-        symbol: _price_series(symbol, start_date, end_date)
-        for symbol in tickers + bear_tickers + [spy_symbol]
-    }
+    prices_df = _price_frame(tickers + bear_tickers + [spy_symbol], start_date, end_date)
+    price_history = _price_bars(prices_df)
     spy_prices = price_history.pop(spy_symbol)
     dates = [bar.date for bar in spy_prices]
     # Flat FX history so portfolio conversion always succeeds
     fx_history = {
-        f"USD{base_currency}": [PriceBar(date, 4.0) for date in dates],
-        f"EUR{base_currency}": [PriceBar(date, 4.3) for date in dates],
+        f"USD{base_currency}": list(map(PriceBar, dates, repeat(4.0))),
+        f"EUR{base_currency}": list(map(PriceBar, dates, repeat(4.3))),
     }
 
-    rules = ScoringRules(
-        quality=quality_score,
-        value=lambda snap: max(0.0, 100.0 - snap.metrics.get("pe", 0)),
-        growth=growth_score,
-        moat=moat_score,
-        risk=lambda snap: max(0.0, 100.0 - snap.metrics.get("volatility", 0)),
-    )
-
     misc_source = InMemorySource(price_history, {}, membership, fx_history)
     loader = DataLoader(
         price_source=misc_source,
@@ -189,11 +345,8 @@ def run_backtest(start_date: str, end_date: str, initial_capital: float, base_cu
         membership_source=misc_source,
         fx_source=misc_source,
     )
-    scorer = FundamentalScorer(rules)
-    scored_fundamentals = {
-        symbol: scorer.score(symbol, loader.load_fundamentals(symbol))
-        for symbol in fundamentals_raw.keys()
-    }
+    scorer = make_scorer(strategy_cfg.scoring)
+    scored_fundamentals = _score_fundamentals(loader, scorer, list(fundamentals_raw.keys()))
 
     universe = UniverseBuilder(loader)
     portfolio_manager = PortfolioManager(strategy_cfg.portfolio, strategy_cfg.rebalancing)
@@ -203,8 +356,10 @@ def run_backtest(start_date: str, end_date: str, initial_capital: float, base_cu
     top100 = universe.build_top_market_cap("SP500")
     report = backtester.run(spy_prices, price_history, scored_fundamentals, top100, fx_history)
 
-    equity_df = pd.DataFrame(report.equity_curve, columns=["date", "equity_pln"])
-    equity_df.to_csv("reports/equity_curve.csv", index=False)
+    with open("reports/equity_curve.csv", "w", newline="") as fh:
+        writer = csv.writer(fh, lineterminator="\n")
+        writer.writerow(["date", "equity_pln"])
+        writer.writerows((date, f"{equity:.4f}") for date, equity in report.equity_curve)
 
     # Persist and display the analyzed period for visibility in CI logs and artifacts
     summary_path = Path("reports/backtest_summary.txt")
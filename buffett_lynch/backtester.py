@@ -1,10 +1,16 @@
 """Backtesting engine for the Buffett/Lynch 2.0 strategy."""
 from __future__ import annotations
 
+import datetime
+import functools
 import math
-from datetime import datetime
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from operator import attrgetter
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from .config import BacktestConfig, PortfolioConfig, RebalancingConfig
 from .currency_engine import CurrencyEngine
@@ -15,6 +21,34 @@ from .portfolio_manager import PortfolioManager
 from .universe_builder import UniverseBuilder
 
 
+# Exits driven by fundamentals or regime bypass the minimum holding period
+_FUNDAMENTAL_REASONS: FrozenSet[str] = frozenset(
+    {"Bear regime", "Lost TOP100", "ValueScore guardrail", "Below TOP3N buffer"}
+)
+
+_TOTAL_KEY = attrgetter("total")
+
+
+@functools.lru_cache(maxsize=None)
+def _day_ordinal(iso_date: str) -> int:
+    """Proleptic ordinal of a strict ``YYYY-MM-DD`` date string."""
+    return datetime.date(int(iso_date[:4]), int(iso_date[5:7]), int(iso_date[8:10])).toordinal()
+
+
+# Market data shared by every run of a sweep; set once per worker process by ``run_many``
+_SHARED_RUN_INPUTS: Tuple = ()
+
+
+def _set_shared_run_inputs(inputs: Tuple) -> None:
+    global _SHARED_RUN_INPUTS
+    _SHARED_RUN_INPUTS = inputs
+
+
+def _run_with_shared_inputs(parts: Tuple) -> "BacktestReport":
+    # run() never reads the universe, so workers rebuild the backtester without it
+    return Backtester(None, *parts).run(*_SHARED_RUN_INPUTS)
+
+
 @dataclass
 class BacktestReport:
     cagr: float
@@ -63,29 +97,31 @@ class Backtester:
             "sma_lookback",
             self.execution.cfg.sma_lookback,
         )
+        spy_dates = [bar.date for bar in spy_prices]
+        rebalance_dates = self._rebalance_schedule(spy_dates)
+        rebalance_set = set(rebalance_dates)
+        # Orders only read the SMA on rebalance dates, so only those values are kept
         sma_cache: Dict[str, Dict[str, float]] = {
-            symbol: sma(prices, lookback) for symbol, prices in price_history.items()
+            symbol: sma(prices, lookback, only_dates=rebalance_set) for symbol, prices in price_history.items()
         }
-        price_lookup: Dict[str, Dict[str, float]] = {
-            symbol: {bar.date: bar.close for bar in prices} for symbol, prices in price_history.items()
-        }
-        rebalance_dates = self._rebalance_schedule([bar.date for bar in spy_prices])
-        rebalance_set = set(rebalance_dates)
-        equity_curve: List[Tuple[str, float]] = []
+        scores_by_year = self._scores_by_year(fundamentals, sorted({date[:4] for date in rebalance_dates}))
+        # Dense (symbol x day) close matrix so daily valuation is a dot product per holding period
+        symbols = list(price_history)
+        symbol_index = {symbol: row for row, symbol in enumerate(symbols)}
+        price_matrix = self._price_matrix(price_history, symbols, spy_dates)
+        holdings_qty = np.zeros(len(symbols))
+        # (first day index, quantities held from that day until the next segment starts)
+        holding_segments: List[Tuple[int, np.ndarray]] = []
+        capital_by_day = np.empty(len(spy_dates))
         holdings: Dict[str, Position] = {}
         holding_periods: List[float] = []
         currency_map: Dict[str, str] = {}
-        daily_returns: List[float] = []
         bull_days = bear_days = 0
         transactions = 0
-        current_scores: List[ScoredCompany] = []
-        current_picks: List[ScoredCompany] = []
 
-        spy_dates = [bar.date for bar in spy_prices]
         capital_pln = self.config.initial_capital
-        prev_value = capital_pln
 
-        for date in spy_dates:
+        for day, date in enumerate(spy_dates):
             regime = regime_map.get(date)
             capital_pln += self.config.contributions.get(date, 0.0)
             if regime == "bull":
@@ -93,36 +129,33 @@ class Backtester:
             elif regime == "bear":
                 bear_days += 1
 
-            year = date[:4]
-            top100 = top100_by_year.get(year, [])
             rebalance_due = date in rebalance_set
-            if rebalance_due:
-                current_scores = self._scores_for_year(fundamentals, year)
-                current_picks = sorted(current_scores, key=lambda s: s.total, reverse=True)
-            picks = list(current_picks)
             orders = []
+            day_close: Dict[str, float] = {}
 
-            # Portfolio changes are constrained to the scoring/rebalance schedule.
+            # Portfolio changes are constrained to the scoring/rebalance schedule, so ranking,
+            # pricing and order generation only happen on rebalance days.
             if rebalance_due:
+                year = date[:4]
+                top100 = top100_by_year.get(year, [])
+                day_close = dict(zip(symbols, price_matrix[:, day].tolist()))
                 orders = self.execution.generate_orders(
                     date,
-                    picks,
+                    scores_by_year[year],
                     top100,
                     spy_regime=regime or "bear",
-                    price_map={
-                        s: self._get_price(price_lookup, price_history, s, date)
-                        for s in top100 + [self.bear_symbol]
-                    },
+                    price_map={s: day_close.get(s, 0) for s in top100 + [self.bear_symbol]},
                     sma_map=sma_cache,
                     portfolio=holdings,
                     bear_asset=(self.bear_symbol, self.bear_currency),
                     rebalance_due=rebalance_due,
                 )
             transactions += len(orders)
+            holdings_changed = day == 0
 
             # Simplified fill: adjust positions by target weight using available capital
             for order in orders:
-                price = order.price or self._get_price(price_lookup, price_history, order.symbol, date)
+                price = order.price or day_close.get(order.symbol, 0)
                 if price == 0:
                     continue
                 if order.action == "SELL":
@@ -131,12 +164,12 @@ class Backtester:
                     if order.symbol in holdings:
                         pos = holdings[order.symbol]
                         if pos.entry_date:
-                            held_days = (
-                                datetime.fromisoformat(date) - datetime.fromisoformat(pos.entry_date)
-                            ).days
-                            holding_periods.append(held_days)
+                            holding_periods.append(_day_ordinal(date) - _day_ordinal(pos.entry_date))
                         capital_pln += holdings[order.symbol].quantity * price
                         del holdings[order.symbol]
+                        if order.symbol in symbol_index:
+                            holdings_qty[symbol_index[order.symbol]] = 0.0
+                        holdings_changed = True
                 else:
                     if order.reason.startswith("Bear regime"):
                         quantity = capital_pln / price
@@ -152,20 +185,28 @@ class Backtester:
                     )
                     capital_pln -= quantity * price
                     currency_map[order.symbol] = order.currency
+                    if order.symbol in symbol_index:
+                        holdings_qty[symbol_index[order.symbol]] = quantity
+                    holdings_changed = True
 
-            portfolio_value = capital_pln
-            for symbol, pos in holdings.items():
-                day_price = self._get_price(price_lookup, price_history, symbol, date)
-                if day_price:
-                    portfolio_value += pos.quantity * day_price
-            portfolio_pln = self.currency.portfolio_to_pln({s: portfolio_value for s in ["portfolio"]}, fx_history, date, {"portfolio": "PLN"})
-            equity_curve.append((date, portfolio_pln))
-            if prev_value > 0:
-                daily_returns.append((portfolio_pln - prev_value) / prev_value)
-            prev_value = portfolio_pln
-
-        cagr = self._cagr(equity_curve)
-        max_dd = self._max_drawdown(equity_curve)
+            if holdings_changed:
+                holding_segments.append((day, holdings_qty.copy()))
+            capital_by_day[day] = capital_pln
+
+        portfolio_value = self._portfolio_values(price_matrix, holding_segments, capital_by_day)
+        # The portfolio is tracked in PLN, so only the PLN->base rate applies
+        if self.currency.base_currency == "PLN":
+            equity = portfolio_value
+        else:
+            pln_rate = np.array([self.currency.fx_to_pln(fx_history, date, "PLN") for date in spy_dates])
+            equity = portfolio_value * pln_rate
+        equity_curve: List[Tuple[str, float]] = list(zip(spy_dates, equity.tolist()))
+        prev_equity = np.concatenate(([self.config.initial_capital], equity[:-1]))
+        has_base = prev_equity > 0
+        daily_returns = (equity[has_base] - prev_equity[has_base]) / prev_equity[has_base]
+
+        cagr = self._cagr(equity)
+        max_dd = self._max_drawdown(equity)
         sharpe = self._sharpe(daily_returns)
         avg_hold = self._avg_holding_days(holding_periods)
         total_days = bull_days + bear_days or 1
@@ -181,30 +222,58 @@ class Backtester:
         )
         return report
 
-    def _cagr(self, equity_curve: List[Tuple[str, float]]) -> float:
-        if not equity_curve:
+    @staticmethod
+    def run_many(
+        backtesters: Sequence["Backtester"],
+        spy_prices: List[PriceBar],
+        price_history: Dict[str, List[PriceBar]],
+        fundamentals: Dict[str, List[ScoredCompany]],
+        top100_by_year: Dict[str, List[str]],
+        fx_history: Dict[str, List[PriceBar]],
+        max_workers: Optional[int] = None,
+    ) -> List[BacktestReport]:
+        """Run independent backtests (e.g. a parameter sweep) over the same data in parallel.
+
+        A single run is path dependent and stays sequential; separate configurations are not.
+        The market data is handed to each worker process once through the pool initializer
+        instead of being pickled with every task. Tasks carry only the components a run uses,
+        not the universe, whose data loader may hold locks, network clients and memo caches.
+        Reports come back in input order.
+        """
+        inputs = (spy_prices, price_history, fundamentals, top100_by_year, fx_history)
+        tasks = [
+            (bt.scorer, bt.portfolio_manager, bt.execution, bt.currency, bt.config) for bt in backtesters
+        ]
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_set_shared_run_inputs,
+            initargs=(inputs,),
+        ) as pool:
+            return list(pool.map(_run_with_shared_inputs, tasks))
+
+    def _cagr(self, equity: np.ndarray) -> float:
+        if not equity.size:
             return 0.0
-        start_value = equity_curve[0][1]
-        end_value = equity_curve[-1][1]
-        years = max(1, len(equity_curve) / 252)
+        start_value = float(equity[0])
+        end_value = float(equity[-1])
+        years = max(1, equity.size / 252)
         return (end_value / start_value) ** (1 / years) - 1
 
-    def _max_drawdown(self, equity_curve: List[Tuple[str, float]]) -> float:
-        peak = -math.inf
-        max_dd = 0.0
-        for _, value in equity_curve:
-            peak = max(peak, value)
-            if peak > 0:
-                dd = (peak - value) / peak
-                max_dd = max(max_dd, dd)
-        return max_dd
-
-    def _sharpe(self, daily_returns: List[float], risk_free: float = 0.0) -> float:
-        if not daily_returns:
+    def _max_drawdown(self, equity: np.ndarray) -> float:
+        if not equity.size:
             return 0.0
-        mean = sum(daily_returns) / len(daily_returns)
-        variance = sum((r - mean) ** 2 for r in daily_returns) / len(daily_returns)
-        std = math.sqrt(variance)
+        peaks = np.maximum.accumulate(equity)
+        positive = peaks > 0
+        if not positive.any():
+            return 0.0
+        drawdowns = (peaks[positive] - equity[positive]) / peaks[positive]
+        return max(0.0, float(drawdowns.max()))
+
+    def _sharpe(self, daily_returns: np.ndarray, risk_free: float = 0.0) -> float:
+        if not daily_returns.size:
+            return 0.0
+        mean = float(daily_returns.mean())
+        std = float(daily_returns.std())
         if std == 0:
             return 0.0
         return (mean - risk_free / 252) / std * math.sqrt(252)
@@ -214,17 +283,30 @@ class Backtester:
             return 0.0
         return sum(holding_periods) / len(holding_periods)
 
-    def _scores_for_year(self, fundamentals: Dict[str, List[ScoredCompany]], year: str) -> List[ScoredCompany]:
-        """Return the most recent scores up to the requested year for each symbol."""
-        year_int = int(year)
-        scores: List[ScoredCompany] = []
-        for symbol, entries in fundamentals.items():
-            eligible = [s for s in entries if s.market_cap > 0 and int(s.period) <= year_int]
-            if not eligible:
-                continue
-            latest = sorted(eligible, key=lambda s: int(s.period), reverse=True)[0]
-            scores.append(latest)
-        return scores
+    def _scores_by_year(
+        self, fundamentals: Dict[str, List[ScoredCompany]], years: List[str]
+    ) -> Dict[str, List[ScoredCompany]]:
+        """Return, per year, each symbol's most recent score up to that year ranked by total."""
+        # Index every symbol's scores by period once; the first entry wins on duplicate periods
+        indexed: List[Tuple[List[int], List[ScoredCompany]]] = []
+        for entries in fundamentals.values():
+            by_period: Dict[int, ScoredCompany] = {}
+            for score in entries:
+                if score.market_cap > 0:
+                    by_period.setdefault(int(score.period), score)
+            periods = sorted(by_period)
+            indexed.append((periods, [by_period[period] for period in periods]))
+
+        scores_by_year: Dict[str, List[ScoredCompany]] = {}
+        for year in years:
+            year_int = int(year)
+            scores: List[ScoredCompany] = []
+            for periods, scored in indexed:
+                pos = bisect_right(periods, year_int)
+                if pos:
+                    scores.append(scored[pos - 1])
+            scores_by_year[year] = sorted(scores, key=_TOTAL_KEY, reverse=True)
+        return scores_by_year
 
     def _rebalance_schedule(self, dates: List[str]) -> List[str]:
         """Return the allowed rebalance dates. Only quarterly is supported by policy."""
@@ -234,8 +316,7 @@ class Backtester:
         current_key = None
         last_date = None
         for date in sorted(dates):
-            dt = datetime.fromisoformat(date)
-            key = (dt.year, (dt.month - 1) // 3)
+            key = (date[:4], (int(date[5:7]) - 1) // 3)
             if key != current_key and last_date is not None:
                 scheduled.append(last_date)
             current_key = key
@@ -246,28 +327,47 @@ class Backtester:
 
     def _allow_sell(self, order: Order, holdings: Dict[str, Position], date: str) -> bool:
         """Enforce a 90-day minimum holding period for non-fundamental exits."""
-        fundamental_reasons = {"Bear regime", "Lost TOP100", "ValueScore guardrail", "Below TOP3N buffer"}
-        if order.reason in fundamental_reasons:
+        if order.reason in _FUNDAMENTAL_REASONS:
             return True
         pos = holdings.get(order.symbol)
         if not pos or not pos.entry_date:
             return True
-        held_days = (datetime.fromisoformat(date) - datetime.fromisoformat(pos.entry_date)).days
+        held_days = _day_ordinal(date) - _day_ordinal(pos.entry_date)
         return held_days >= 90
 
-    def _get_price(
+    def _price_matrix(
         self,
-        price_lookup: Dict[str, Dict[str, float]],
         price_history: Dict[str, List[PriceBar]],
-        symbol: str,
-        date: str,
-    ) -> float:
-        """Return the daily close if available, otherwise fall back to the latest known price."""
-        price = price_lookup.get(symbol, {}).get(date)
-        if price is not None:
-            return price
-        history = price_history.get(symbol, [])
-        return history[-1].close if history else 0
+        symbols: List[str],
+        dates: List[str],
+    ) -> np.ndarray:
+        """Align closes to ``dates``.
+
+        Days without a bar fall back to the latest known close of the history, and
+        symbols without any history price at 0 so they are never filled or valued.
+        """
+        matrix = np.zeros((len(symbols), len(dates)))
+        for row, symbol in enumerate(symbols):
+            history = price_history[symbol]
+            if not history:
+                continue
+            closes = {bar.date: bar.close for bar in history}
+            fallback = history[-1].close
+            matrix[row] = [closes.get(date, fallback) for date in dates]
+        return matrix
+
+    def _portfolio_values(
+        self,
+        price_matrix: np.ndarray,
+        holding_segments: List[Tuple[int, np.ndarray]],
+        capital_by_day: np.ndarray,
+    ) -> np.ndarray:
+        """Cash plus marked-to-market holdings for every day, one matmul per holding period."""
+        values = capital_by_day.copy()
+        ends = [start for start, _ in holding_segments[1:]] + [len(values)]
+        for (start, quantities), end in zip(holding_segments, ends):
+            values[start:end] += quantities @ price_matrix[:, start:end]
+        return values
 
 
 __all__ = ["Backtester", "BacktestReport"]
@@ -43,10 +43,22 @@ class EmailConfig:
     password: Optional[str] = None
 
 
+@dataclass
+class ScoringConfig:
+    """TotalScore weights; strategy variants differ only in these numbers."""
+
+    quality: float = 0.35
+    growth: float = 0.20
+    moat: float = 0.20
+    value: float = 0.15
+    risk: float = 0.10
+
+
 @dataclass
 class StrategyConfig:
     portfolio: PortfolioConfig = field(default_factory=PortfolioConfig)
     rebalancing: RebalancingConfig = field(default_factory=RebalancingConfig)
     backtest: BacktestConfig = field(default_factory=BacktestConfig)
     email: EmailConfig = field(default_factory=EmailConfig)
+    scoring: ScoringConfig = field(default_factory=ScoringConfig)
 
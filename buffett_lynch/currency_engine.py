@@ -1,7 +1,9 @@
 """FX conversion utilities."""
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
 
 from .models import PriceBar
 from .execution_engine import sma
@@ -10,24 +12,69 @@ from .execution_engine import sma
 class CurrencyEngine:
     def __init__(self, base_currency: str = "PLN"):
         self.base_currency = base_currency
+        self._rate_index: Dict[str, Tuple[List[PriceBar], int, Dict[str, float]]] = {}
 
-    def fx_to_pln(self, fx_history: Dict[str, List[PriceBar]], date: str, currency: str) -> float:
-        pair = f"{currency}{self.base_currency}"
+    def _rates(self, fx_history: Dict[str, List[PriceBar]], pair: str) -> Dict[str, float]:
+        """Date -> close for ``pair``, rebuilt only when a different history list is passed."""
         history = fx_history.get(pair, [])
+        cached = self._rate_index.get(pair)
+        if cached is not None and cached[0] is history and cached[1] == len(history):
+            return cached[2]
+        rates: Dict[str, float] = {}
         for bar in history:
-            if bar.date == date:
-                return bar.close
-        return 1.0 if currency == self.base_currency else 0.0
+            rates.setdefault(bar.date, bar.close)
+        self._rate_index[pair] = (history, len(history), rates)
+        return rates
+
+    def fx_to_pln(self, fx_history: Dict[str, List[PriceBar]], date: str, currency: str) -> float:
+        if currency == self.base_currency:
+            return 1.0
+        return self._rates(fx_history, f"{currency}{self.base_currency}").get(date, 0.0)
+
+    def build_aligned(
+        self, dates: List[str], fx_history: Dict[str, List[PriceBar]], currencies: Iterable[str]
+    ) -> Dict[str, np.ndarray]:
+        """Per-currency rates aligned to ``dates``, forward-filled from the last known bar.
+
+        Dates before a pair's first bar get 0.0, matching ``fx_to_pln`` for unknown dates.
+        The history need not be sorted; a repeated date keeps its first bar, as in ``fx_to_pln``.
+        """
+        targets = np.asarray(dates)
+        aligned: Dict[str, np.ndarray] = {}
+        for currency in currencies:
+            if currency == self.base_currency:
+                aligned[currency] = np.ones(len(dates))
+                continue
+            # Same first-bar-per-date rates as ``fx_to_pln``, sorted for the search
+            rates = self._rates(fx_history, f"{currency}{self.base_currency}")
+            if not rates:
+                aligned[currency] = np.zeros(len(dates))
+                continue
+            known = sorted(rates)
+            bar_dates = np.array(known)
+            closes = np.array([0.0] + [rates[date] for date in known])
+            aligned[currency] = closes[np.searchsorted(bar_dates, targets, side="right")]
+        return aligned
 
     def portfolio_to_pln(self, holdings: Dict[str, float], fx_history: Dict[str, List[PriceBar]], date: str,
-                          currency_map: Dict[str, str]) -> float:
-        total = 0.0
+                          currency_map: Dict[str, str], fx_today: Optional[Dict[str, float]] = None) -> float:
+        """Convert holdings to the base currency, one FX lookup per currency bucket.
+
+        ``fx_today`` may carry the day's rates (e.g. a column of ``build_aligned``); currencies
+        missing from it fall back to ``fx_to_pln``.
+        """
+        buckets: Dict[str, float] = {}
         for symbol, value in holdings.items():
             currency = currency_map.get(symbol, self.base_currency)
-            rate = self.fx_to_pln(fx_history, date, currency)
+            buckets[currency] = buckets.get(currency, 0.0) + value
+        total = 0.0
+        for currency, value in buckets.items():
+            if fx_today is not None and currency in fx_today:
+                rate = fx_today[currency]
+            else:
+                rate = self.fx_to_pln(fx_history, date, currency)
             total += value * rate
         return total
 
-
 __all__ = ["CurrencyEngine"]
 
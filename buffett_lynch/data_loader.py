@@ -1,12 +1,20 @@
 """Data access layer for prices, fundamentals, index membership, and FX."""
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Optional, Protocol
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Protocol, Tuple
+
+import numpy as np
 
 from .fundamental_metrics import FundamentalMetrics
 from .fundamental_raw_metrics import FundamentalRawMetrics
-from .models import FundamentalSnapshot, PriceBar
+from .models import FundamentalPanel, FundamentalSnapshot, PriceBar
+
+_RAW_METRICS = FundamentalRawMetrics()
+_PERCENTILE_METRICS = FundamentalMetrics()
+_BAR_DATE = attrgetter("date")
 
 
 class PriceDataSource(Protocol):
@@ -39,38 +47,114 @@ class DataLoader:
     _enriched_fundamentals: Optional[Dict[str, List[FundamentalSnapshot]]] = field(
         default=None, init=False, repr=False
     )
+    _sorted_cache: Dict[str, List[FundamentalSnapshot]] = field(default_factory=dict, init=False, repr=False)
+    _price_cache: Dict[str, List[PriceBar]] = field(default_factory=dict, init=False, repr=False)
+    _fx_cache: Dict[str, List[PriceBar]] = field(default_factory=dict, init=False, repr=False)
+    _soa_cache: Dict[str, Tuple[np.ndarray, np.ndarray]] = field(default_factory=dict, init=False, repr=False)
+    _by_period_cache: Dict[str, Dict[str, FundamentalSnapshot]] = field(default_factory=dict, init=False, repr=False)
+    _panel_cache: Dict[Tuple[str, str], FundamentalPanel] = field(default_factory=dict, init=False, repr=False)
 
     def load_price_history(self, symbol: str) -> List[PriceBar]:
-        return sorted(self.price_source.price_history(symbol), key=lambda b: b.date)
+        cached = self._price_cache.get(symbol)
+        if cached is None:
+            cached = sorted(self.price_source.price_history(symbol), key=_BAR_DATE)
+            self._price_cache[symbol] = cached
+        return cached
+
+    def load_price_history_soa(self, symbol: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Date-sorted history as parallel ``(dates, closes)`` arrays.
+
+        Dates stay ISO ``YYYY-MM-DD`` strings because every date-keyed map in the engine uses them.
+        """
+        cached = self._soa_cache.get(symbol)
+        if cached is None:
+            bars = self.load_price_history(symbol)
+            dates = np.array([bar.date for bar in bars], dtype="U10")
+            closes = np.fromiter((bar.close for bar in bars), dtype=np.float64, count=len(bars))
+            cached = (dates, closes)
+            self._soa_cache[symbol] = cached
+        return cached
 
     def load_fundamentals(self, symbol: str) -> List[FundamentalSnapshot]:
+        cached = self._sorted_cache.get(symbol)
+        if cached is not None:
+            return cached
+
         if self._enriched_fundamentals is None:
             all_fundamentals = None
             if hasattr(self.fundamentals_source, "all_fundamentals"):
                 all_fundamentals = self.fundamentals_source.all_fundamentals()
 
             if all_fundamentals is not None:
-                raw_enriched = FundamentalRawMetrics().enrich_moat_raw_metrics(all_fundamentals)
-                self._enriched_fundamentals = FundamentalMetrics().enrich_moat_percentiles(
-                    raw_enriched
-                )
+                raw_enriched = _RAW_METRICS.enrich_moat_raw_metrics(all_fundamentals)
+                # The raw pass already copied the source snapshots, so percentiles can go in place
+                self._enriched_fundamentals = _PERCENTILE_METRICS.enrich_moat_percentiles(raw_enriched, inplace=True)
 
+        snaps = None
         if self._enriched_fundamentals is not None:
-            snaps = self._enriched_fundamentals.get(symbol, [])
-            if snaps:
-                return sorted(snaps, key=lambda f: f.period)
-
-        raw = self.fundamentals_source.fundamentals(symbol)
-        raw_enriched = FundamentalRawMetrics().enrich_moat_raw_metrics({symbol: raw})
-        enriched_single = FundamentalMetrics().enrich_moat_percentiles({symbol: raw_enriched.get(symbol, raw)})
-        snaps = enriched_single.get(symbol, raw)
-        return sorted(snaps, key=lambda f: f.period)
+            snaps = self._enriched_fundamentals.get(symbol) or None
+
+        if snaps is None:
+            raw = self.fundamentals_source.fundamentals(symbol)
+            raw_enriched = _RAW_METRICS.enrich_moat_raw_metrics({symbol: raw})
+            enriched_single = _PERCENTILE_METRICS.enrich_moat_percentiles(raw_enriched, inplace=True)
+            snaps = enriched_single.get(symbol, raw)
+
+        # Callers share the cached list, so it must be treated as read-only
+        result = sorted(snaps, key=lambda f: f.period)
+        self._sorted_cache[symbol] = result
+        return result
+
+    def load_fundamentals_by_period(self, symbol: str) -> Dict[str, FundamentalSnapshot]:
+        """Map period -> snapshot; the last snapshot wins when a period repeats."""
+        cached = self._by_period_cache.get(symbol)
+        if cached is None:
+            cached = {snap.period: snap for snap in self.load_fundamentals(symbol)}
+            self._by_period_cache[symbol] = cached
+        return cached
+
+    def load_fundamental_panel(self, index: str, year: str) -> FundamentalPanel:
+        """Columnar snapshots for ``index`` members that report ``year``, in membership order."""
+        key = (index, year)
+        cached = self._panel_cache.get(key)
+        if cached is None:
+            symbols: List[str] = []
+            snaps: List[FundamentalSnapshot] = []
+            for symbol in self.load_index_members(index).get(year, []):
+                snap = self.load_fundamentals_by_period(symbol).get(year)
+                if snap is not None:
+                    symbols.append(symbol)
+                    snaps.append(snap)
+            cached = FundamentalPanel.from_snapshots(snaps, symbols)
+            self._panel_cache[key] = cached
+        return cached
+
+    def load_many_prices(self, symbols: Iterable[str]) -> Dict[str, List[PriceBar]]:
+        """Load several price histories concurrently; results are cached like single loads."""
+        unique = list(dict.fromkeys(symbols))
+        with ThreadPoolExecutor(max_workers=min(32, len(unique) or 1)) as pool:
+            return dict(zip(unique, pool.map(self.load_price_history, unique)))
+
+    def load_many_fundamentals(self, symbols: Iterable[str]) -> Dict[str, List[FundamentalSnapshot]]:
+        """Load several symbols' fundamentals concurrently."""
+        unique = list(dict.fromkeys(symbols))
+        if not unique:
+            return {}
+        # The first load builds the shared universe enrichment; the rest only read it
+        result = {unique[0]: self.load_fundamentals(unique[0])}
+        with ThreadPoolExecutor(max_workers=min(32, len(unique))) as pool:
+            result.update(zip(unique[1:], pool.map(self.load_fundamentals, unique[1:])))
+        return result
 
     def load_index_members(self, index: str) -> Dict[str, List[str]]:
         return self.membership_source.members(index)
 
     def load_fx_history(self, pair: str) -> List[PriceBar]:
-        return sorted(self.fx_source.history(pair), key=lambda b: b.date)
+        cached = self._fx_cache.get(pair)
+        if cached is None:
+            cached = sorted(self.fx_source.history(pair), key=_BAR_DATE)
+            self._fx_cache[pair] = cached
+        return cached
 
 
 class InMemorySource(PriceDataSource, FundamentalsDataSource, IndexMembershipSource, FXRateSource):
@@ -17,18 +17,20 @@ class DummyIndexMembershipSource(IndexMembershipSource):
 
     def __init__(self, fundamentals_source):
         self.fundamentals_source = fundamentals_source
+        self._cache: Dict[str, Dict[str, List[str]]] = {}
 
     def members(self, index: str) -> Dict[str, List[str]]:
-        """Zwraca mapping: rok -> lista symboli."""
+        """Zwraca mapping: rok -> lista symboli (liczone raz, lista współdzielona między latami)."""
+        cached = self._cache.get(index)
+        if cached is not None:
+            return cached
+
         all_fundamentals = self.fundamentals_source.all_fundamentals()
         symbols = list(all_fundamentals.keys())
 
         # Ustalmy lata dostępnych raportów
-        years = set()
-        for snaps in all_fundamentals.values():
-            for snap in snaps:
-                years.add(snap.period)
-
-        years = sorted(list(years))
+        years = {snap.period for snaps in all_fundamentals.values() for snap in snaps}
 
-        return {year: symbols for year in years}
+        cached = dict.fromkeys(sorted(years), symbols)
+        self._cache[index] = cached
+        return cached
@@ -1,37 +1,65 @@
 """Signal engine applying Buffett/Lynch 2.0 trading rules."""
 from __future__ import annotations
 
-from typing import Dict, List
+import heapq
+from operator import attrgetter
+from types import MappingProxyType
+from typing import AbstractSet, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+import numpy as np
 
 from .config import PortfolioConfig
 from .models import Order, Position, PriceBar, ScoredCompany
 
 
-def sma(prices: List[PriceBar], lookback: int) -> Dict[str, float]:
-    values: Dict[str, float] = {}
-    window: List[float] = []
-    for bar in prices:
-        window.append(bar.close)
-        if len(window) > lookback:
-            window.pop(0)
-        if len(window) == lookback:
-            values[bar.date] = sum(window) / lookback
-    return values
+_TOTAL_KEY = attrgetter("total")
+# Shared read-only default for symbols without an SMA series
+_NO_SMA: Mapping[str, float] = MappingProxyType({})
+
+# (hold buffer ranked by total, its symbols, symbol -> pick for every eligible pick)
+_Ranking = Tuple[List[ScoredCompany], Set[str], Dict[str, ScoredCompany]]
+
+
+def sma_values(closes: np.ndarray, lookback: int) -> np.ndarray:
+    """Trailing mean over contiguous closes; entry ``i`` averages ``closes[i:i + lookback]``.
+
+    Window sums are differences of one running cumulative sum, so the cost is O(n)
+    regardless of ``lookback``. Closes are taken relative to the first one so the running
+    sum stays small and long histories do not lose precision to cancellation.
+    """
+    if lookback <= 0 or len(closes) < lookback:
+        return np.empty(0)
+    anchor = closes[0]
+    running = np.cumsum(closes - anchor)
+    sums = running[lookback - 1:].copy()
+    sums[1:] -= running[:-lookback]
+    return sums / lookback + anchor
+
+
+def sma(prices: List[PriceBar], lookback: int, only_dates: Optional[AbstractSet[str]] = None) -> Dict[str, float]:
+    """Date -> trailing SMA; ``only_dates`` restricts the map to the dates a caller will read."""
+    closes = np.fromiter((bar.close for bar in prices), dtype=np.float64, count=len(prices))
+    averages = sma_values(closes, lookback)
+    dates = (bar.date for bar in prices[lookback - 1:])
+    if only_dates is None:
+        return dict(zip(dates, averages.tolist()))
+    return {date: value for date, value in zip(dates, averages.tolist()) if date in only_dates}
 
 
 class ExecutionEngine:
     def __init__(self, portfolio_cfg: PortfolioConfig):
         self.cfg = portfolio_cfg
+        # (picks, top100, hold size, ranking) of the last call; rebalances within a year reuse it
+        self._ranking_memo: Optional[Tuple[object, object, int, _Ranking]] = None
 
     def bull_bear(self, spy_prices: List[PriceBar]) -> Dict[str, str]:
-        trend = sma(spy_prices, self.cfg.sma_lookback)
-        regime: Dict[str, str] = {}
-        for bar in spy_prices:
-            avg = trend.get(bar.date)
-            if avg is None:
-                continue
-            regime[bar.date] = "bull" if bar.close >= avg else "bear"
-        return regime
+        lookback = self.cfg.sma_lookback
+        closes = np.fromiter((bar.close for bar in spy_prices), dtype=np.float64, count=len(spy_prices))
+        trend = sma_values(closes, lookback)
+        if not trend.size:
+            return {}
+        labels = np.where(closes[lookback - 1:] >= trend, "bull", "bear")
+        return dict(zip((bar.date for bar in spy_prices[lookback - 1:]), labels.tolist()))
 
     def bear_asset(self, base_currency: str | None = None) -> tuple[str, str]:
         """Return the preferred T-Bill ETF symbol and its currency."""
@@ -47,7 +75,7 @@ class ExecutionEngine:
         self,
         date: str,
         picks: List[ScoredCompany],
-        top100: List[str],
+        top100: Iterable[str],
         spy_regime: str,
         price_map: Dict[str, float],
         sma_map: Dict[str, Dict[str, float]],
@@ -79,48 +107,66 @@ class ExecutionEngine:
                     )
             return orders
 
-        sorted_picks = [p for p in sorted(picks, key=lambda p: p.total, reverse=True) if p.symbol in top100]
-        top_n = self.cfg.top_n
-        top_buy = sorted_picks[:top_n]
-        top_hold = sorted_picks[: self.cfg.hold_multiplier * top_n]
-        top_hold_symbols = {p.symbol for p in top_hold}
-        pick_map = {p.symbol: p for p in sorted_picks}
+        min_value_score = self.cfg.min_value_score
+        add_order = orders.append
+        top100_set = top100 if isinstance(top100, (set, frozenset)) else frozenset(top100)
+        top_hold, top_hold_symbols, pick_map = self._rank_picks(picks, top100, top100_set)
+        top_buy = top_hold[: self.cfg.top_n]
 
+        # Checks run cheapest first; price and SMA are only looked up for positions that
+        # survive the membership and guardrail tests
         for pos in list(portfolio.values()):
-            sma_value = sma_map.get(pos.symbol, {}).get(date)
-            price = price_map.get(pos.symbol, 0)
-            pick = pick_map.get(pos.symbol)
-
-            if pos.symbol not in top100:
-                orders.append(Order(pos.symbol, "SELL", pos.quantity, pos.currency, reason="Lost TOP100"))
+            if pos.symbol not in top100_set:
+                add_order(Order(pos.symbol, "SELL", pos.quantity, pos.currency, reason="Lost TOP100"))
                 continue
 
-            if pick and pick.value < self.cfg.min_value_score:
-                orders.append(Order(pos.symbol, "SELL", pos.quantity, pos.currency, reason="ValueScore guardrail"))
+            pick = pick_map.get(pos.symbol)
+            if pick and pick.value < min_value_score:
+                add_order(Order(pos.symbol, "SELL", pos.quantity, pos.currency, reason="ValueScore guardrail"))
                 continue
 
             if pos.symbol not in top_hold_symbols:
-                orders.append(Order(pos.symbol, "SELL", pos.quantity, pos.currency, reason="Below TOP3N buffer"))
+                add_order(Order(pos.symbol, "SELL", pos.quantity, pos.currency, reason="Below TOP3N buffer"))
                 continue
 
-            if sma_value is not None and price < sma_value:
-                orders.append(Order(pos.symbol, "SELL", pos.quantity, pos.currency, reason="Price below SMA200"))
+            sma_value = sma_map.get(pos.symbol, _NO_SMA).get(date)
+            if sma_value is not None and price_map.get(pos.symbol, 0) < sma_value:
+                add_order(Order(pos.symbol, "SELL", pos.quantity, pos.currency, reason="Price below SMA200"))
 
         if rebalance_due:
             for pick in top_buy:
-                sma_value = sma_map.get(pick.symbol, {}).get(date)
+                sma_value = sma_map.get(pick.symbol, _NO_SMA).get(date)
                 price = price_map.get(pick.symbol)
                 if price is None or sma_value is None:
                     continue
                 if price <= sma_value:
                     continue
-                if pick.value < self.cfg.min_value_score:
+                if pick.value < min_value_score:
                     continue
                 if pick.symbol not in portfolio:
-                    orders.append(Order(pick.symbol, "BUY", 0.0, "USD", reason="Enter TOP15", price=price))
+                    add_order(Order(pick.symbol, "BUY", 0.0, "USD", reason="Enter TOP15", price=price))
 
         return orders
 
+    def _rank_picks(
+        self, picks: List[ScoredCompany], top100: Iterable[str], top100_set: AbstractSet[str]
+    ) -> _Ranking:
+        """Rank TOP100-eligible picks, reusing the last result for the same input lists.
+
+        The memo is keyed on object identity, so callers must not mutate ``picks`` or
+        ``top100`` in place between calls.
+        """
+        hold_n = self.cfg.hold_multiplier * self.cfg.top_n
+        memo = self._ranking_memo
+        if memo is not None and memo[0] is picks and memo[1] is top100 and memo[2] == hold_n:
+            return memo[3]
+        eligible = [p for p in picks if p.symbol in top100_set]
+        # Only the hold buffer needs ranking; nlargest keeps sorted()'s tie order
+        top_hold = heapq.nlargest(hold_n, eligible, key=_TOTAL_KEY)
+        ranking = (top_hold, {p.symbol for p in top_hold}, {p.symbol: p for p in eligible})
+        self._ranking_memo = (picks, top100, hold_n, ranking)
+        return ranking
+
 
 __all__ = ["ExecutionEngine", "sma"]
 
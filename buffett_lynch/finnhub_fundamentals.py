@@ -2,15 +2,35 @@
 from __future__ import annotations
 
 import json
+import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .data_loader import FundamentalsDataSource
 from .models import FundamentalSnapshot
 
+try:  # orjson parses the cache several times faster; the stdlib is the fallback
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _loads = json.loads
+
 
 @dataclass
 class FinnhubFundamentalsSource(FundamentalsDataSource):
@@ -20,11 +40,19 @@ class FinnhubFundamentalsSource(FundamentalsDataSource):
     symbols: Optional[List[str]] = None
     cache_dir: Path = field(default_factory=lambda: Path("data/finnhub_cache"))
     _cache: Dict[str, List[FundamentalSnapshot]] = field(default_factory=dict, init=False, repr=False)
+    _session: requests.Session = field(init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
 
     def __post_init__(self) -> None:
         if not self.api_key:
             raise ValueError("FINNHUB_API_KEY is required for FinnhubFundamentalsSource")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Keep-alive connections are reused across symbols; transient errors and 429s are retried
+        self._session = requests.Session()
+        retry = Retry(
+            total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False
+        )
+        self._session.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry))
 
     def fundamentals(self, symbol: str) -> List[FundamentalSnapshot]:
         if symbol in self._cache:
@@ -32,35 +60,42 @@ class FinnhubFundamentalsSource(FundamentalsDataSource):
 
         cached = self._load_cache(symbol)
         if cached is not None:
-            self._cache[symbol] = cached
+            with self._lock:
+                self._cache[symbol] = cached
             return cached
 
         financials = self._fetch_financials(symbol)
         metrics = self._fetch_metrics(symbol)
         snapshots = self._build_snapshots(symbol, financials, metrics)
-        self._cache[symbol] = snapshots
+        with self._lock:
+            self._cache[symbol] = snapshots
         self._write_cache(symbol, snapshots)
         return snapshots
 
     def all_fundamentals(self) -> Dict[str, List[FundamentalSnapshot]]:
         symbols = self.symbols or list(self._cache.keys())
-        fundamentals: Dict[str, List[FundamentalSnapshot]] = {}
-        for symbol in symbols:
-            fundamentals[symbol] = self.fundamentals(symbol)
-        return fundamentals
+        # Warm start: everything already stored comes back from a single query
+        missing = [symbol for symbol in symbols if symbol not in self._cache]
+        if missing:
+            stored = self._load_cache_many(missing)
+            with self._lock:
+                self._cache.update(stored)
+        # Requests are I/O bound; the pool is bounded and the session retries 429s with backoff
+        with ThreadPoolExecutor(max_workers=min(16, len(symbols) or 1)) as pool:
+            return dict(zip(symbols, pool.map(self.fundamentals, symbols)))
 
     # --- Finnhub helpers -------------------------------------------------
     def _fetch_financials(self, symbol: str) -> Dict:
         url = "https://finnhub.io/api/v1/stock/financials-reported"
         params = {"symbol": symbol, "freq": "annual", "token": self.api_key}
-        response = requests.get(url, params=params, timeout=30)
+        response = self._session.get(url, params=params, timeout=30)
         response.raise_for_status()
         return response.json() or {}
 
     def _fetch_metrics(self, symbol: str) -> Dict:
         url = "https://finnhub.io/api/v1/stock/metric"
         params = {"symbol": symbol, "metric": "all", "token": self.api_key}
-        response = requests.get(url, params=params, timeout=30)
+        response = self._session.get(url, params=params, timeout=30)
         response.raise_for_status()
         return response.json() or {}
 
@@ -135,19 +170,14 @@ class FinnhubFundamentalsSource(FundamentalsDataSource):
         return snapshots
 
     def _attach_growth_and_volatility(self, snaps: List[FundamentalSnapshot], revenue_history: Dict[str, float]) -> None:
-        years_sorted = sorted(revenue_history.keys())
+        years_sorted = sorted(revenue_history)
         growth_series: Dict[str, float] = {}
-        for idx, year in enumerate(years_sorted):
-            if idx == 0:
-                continue
-            prev_year = years_sorted[idx - 1]
-            prev_rev = revenue_history.get(prev_year)
-            curr_rev = revenue_history.get(year)
-            if prev_rev and curr_rev is not None:
-                growth_series[year] = (curr_rev - prev_rev) / prev_rev * 100.0
-
-        growth_values = list(growth_series.values())
-        volatility_penalty = float(self._std(growth_values)) if growth_values else 0.0
+        for prev_year, year in zip(years_sorted, years_sorted[1:]):
+            prev_rev = revenue_history[prev_year]
+            if prev_rev:
+                growth_series[year] = (revenue_history[year] - prev_rev) / prev_rev * 100.0
+
+        volatility_penalty = self._std(growth_series.values())
 
         for snap in snaps:
             year = snap.period
@@ -165,13 +195,16 @@ class FinnhubFundamentalsSource(FundamentalsDataSource):
                 snap.metrics["roic_history"] = [float(metric_block["roic"])]
             return
 
-        for snap in snaps:
-            history: List[float] = []
-            for year, value in sorted(roic_series.items()):
-                if year <= snap.period:
-                    history.append(float(value))
+        # Walk snapshots in period order and extend one prefix of the sorted series
+        items = sorted(roic_series.items())
+        history: List[float] = []
+        pos = 0
+        for snap in sorted(snaps, key=lambda s: s.period):
+            while pos < len(items) and items[pos][0] <= snap.period:
+                history.append(float(items[pos][1]))
+                pos += 1
             if history:
-                snap.metrics["roic_history"] = history
+                snap.metrics["roic_history"] = list(history)
 
     def _parse_series(self, series: List[Dict]) -> Dict[str, float]:
         values: Dict[str, float] = {}
@@ -205,35 +238,60 @@ class FinnhubFundamentalsSource(FundamentalsDataSource):
                 return mapping[key]
         return None
 
-    def _std(self, values: List[float]) -> float:
-        if len(values) < 2:
-            return 0.0
-        mean = sum(values) / len(values)
-        variance = sum((v - mean) ** 2 for v in values) / (len(values) - 1)
-        return variance ** 0.5
+    def _std(self, values: Iterable[float]) -> float:
+        """Sample standard deviation (ddof=1); 0.0 for fewer than two values."""
+        arr = np.fromiter(values, dtype=np.float64)
+        return float(arr.std(ddof=1)) if arr.size > 1 else 0.0
 
-    def _cache_path(self, symbol: str) -> Path:
+    def _store_path(self) -> Path:
+        return self.cache_dir / "fundamentals.sqlite"
+
+    def _legacy_cache_path(self, symbol: str) -> Path:
+        """Per-symbol JSON file written by earlier versions; read once and moved into the store."""
         return self.cache_dir / f"{symbol}_fundamentals.json"
 
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._store_path())
+        conn.execute("CREATE TABLE IF NOT EXISTS fundamentals (symbol TEXT PRIMARY KEY, payload BLOB NOT NULL)")
+        return conn
+
     def _load_cache(self, symbol: str) -> Optional[List[FundamentalSnapshot]]:
-        path = self._cache_path(symbol)
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT payload FROM fundamentals WHERE symbol = ?", (symbol,)).fetchone()
+        if row is not None:
+            return self._decode_snapshots(row[0])
+
+        path = self._legacy_cache_path(symbol)
         if not path.exists():
             return None
-        data = json.loads(path.read_text())
+        snaps = self._decode_snapshots(path.read_bytes())
+        self._write_cache(symbol, snaps)
+        return snaps
+
+    def _load_cache_many(self, symbols: Iterable[str]) -> Dict[str, List[FundamentalSnapshot]]:
+        wanted = set(symbols)
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT symbol, payload FROM fundamentals").fetchall()
+        return {symbol: self._decode_snapshots(payload) for symbol, payload in rows if symbol in wanted}
+
+    def _decode_snapshots(self, payload: bytes) -> List[FundamentalSnapshot]:
+        data = _loads(payload)
+        intern = sys.intern
         snaps: List[FundamentalSnapshot] = []
+        # Decoded strings are fresh per payload; interning shares one copy of each
+        # metric name, period and sector across the whole universe
         for item in data.get("snapshots", []):
             snaps.append(
                 FundamentalSnapshot(
-                    period=item["period"],
+                    period=intern(item["period"]),
                     market_cap=item.get("market_cap", 0.0),
-                    sector=item.get("sector", "Unknown"),
-                    metrics=item.get("metrics", {}),
+                    sector=intern(item.get("sector", "Unknown")),
+                    metrics={intern(key): value for key, value in item.get("metrics", {}).items()},
                 )
             )
         return snaps
 
     def _write_cache(self, symbol: str, snaps: List[FundamentalSnapshot]) -> None:
-        path = self._cache_path(symbol)
         serializable = {
             "snapshots": [
                 {
@@ -245,7 +303,9 @@ class FinnhubFundamentalsSource(FundamentalsDataSource):
                 for snap in snaps
             ]
         }
-        path.write_text(json.dumps(serializable))
+        payload = _dumps(serializable)
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO fundamentals (symbol, payload) VALUES (?, ?)", (symbol, payload))
 
 
 __all__ = ["FinnhubFundamentalsSource"]
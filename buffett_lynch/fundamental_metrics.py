@@ -7,8 +7,9 @@ median fallbacks when raw inputs are missing.
 
 from __future__ import annotations
 
+import warnings
 from dataclasses import dataclass
-from typing import Dict, List, Mapping
+from typing import Dict, List, Mapping, Tuple
 
 import numpy as np
 
@@ -22,16 +23,27 @@ MOAT_OUTPUT_KEYS = {
 }
 
 
-def _percentile_rank(value: float, peers: List[float]) -> float:
-    if not peers:
-        return 0.0
-    arr = np.array(peers, dtype=float)
-    return float((arr <= value).sum()) / len(arr) * 100.0
+def _percentile_matrix(values: np.ndarray) -> np.ndarray:
+    """Rank every row against its column peers.
 
+    ``values`` has shape ``(n_snapshots, n_metrics)``; entry ``[i, k]`` of the
+    result is the share of peers whose metric ``k`` is ``<=`` that of row ``i``.
+    Each column is sorted once and all its values are located with a single
+    right-sided ``searchsorted``, i.e. O(n log n) instead of O(n^2) comparisons.
+    """
+    ranks = np.empty_like(values)
+    for col in range(values.shape[1]):
+        column = values[:, col]
+        ranks[:, col] = np.searchsorted(np.sort(column), column, side="right") / values.shape[0] * 100.0
+    return ranks
 
-def _median(values: List[float]) -> float:
-    clean = [v for v in values if v is not None]
-    return float(np.median(clean)) if clean else 0.0
+
+def _column_medians(values: np.ndarray) -> np.ndarray:
+    """Median of each column ignoring NaNs; columns with no data fall back to 0.0."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns
+        medians = np.nanmedian(values, axis=0)
+    return np.nan_to_num(medians, nan=0.0)
 
 
 @dataclass
@@ -39,51 +51,43 @@ class FundamentalMetrics:
     """Compute and attach moat percentile metrics to fundamental snapshots."""
 
     def enrich_moat_percentiles(
-        self, fundamentals: Mapping[str, List[FundamentalSnapshot]]
+        self, fundamentals: Mapping[str, List[FundamentalSnapshot]], inplace: bool = False
     ) -> Dict[str, List[FundamentalSnapshot]]:
-        # Collect raw metric values per year for percentile evaluation
-        year_values: Dict[str, Dict[str, List[float]]] = {}
-        for snaps in fundamentals.values():
-            for snap in snaps:
-                per_metric = year_values.setdefault(snap.period, {key: [] for key in MOAT_OUTPUT_KEYS})
-                for output_key, source_key in MOAT_OUTPUT_KEYS.items():
-                    per_metric.setdefault(output_key, [])
-                    value = snap.metrics.get(source_key)
-                    if value is not None:
-                        per_metric[output_key].append(value)
-
-        # Compute medians and peers that inject medians for missing values
-        medians: Dict[str, Dict[str, float]] = {}
-        peers: Dict[str, Dict[str, List[float]]] = {}
-        for year, metric_values in year_values.items():
-            medians[year] = {}
-            peers[year] = {}
-            for output_key, values in metric_values.items():
-                med = _median(values)
-                medians[year][output_key] = med
-                peers[year][output_key] = []
-
-        # Build peer lists with medians filling missing values
-        for snaps in fundamentals.values():
-            for snap in snaps:
-                for output_key, source_key in MOAT_OUTPUT_KEYS.items():
-                    value = snap.metrics.get(source_key)
-                    year = snap.period
-                    fallback = medians.get(year, {}).get(output_key, 0.0)
-                    peers[year][output_key].append(value if value is not None else fallback)
+        """Attach moat percentiles; with ``inplace`` the given snapshots' metrics are updated."""
+        output_keys = list(MOAT_OUTPUT_KEYS)
+        source_keys = [MOAT_OUTPUT_KEYS[key] for key in output_keys]
+
+        # One pass groups each yearly universe and collects its raw peer values
+        members_by_year: Dict[str, List[Tuple[str, int]]] = {}
+        rows_by_year: Dict[str, List[List[object]]] = {}
+        for symbol, snaps in fundamentals.items():
+            for idx, snap in enumerate(snaps):
+                metrics = snap.metrics
+                members_by_year.setdefault(snap.period, []).append((symbol, idx))
+                rows_by_year.setdefault(snap.period, []).append([metrics.get(key) for key in source_keys])
+
+        percentiles: Dict[Tuple[str, int], np.ndarray] = {}
+        for year, members in members_by_year.items():
+            # ``None`` becomes NaN when the peer matrix is materialized
+            values = np.array(rows_by_year[year], dtype=float)
+            # Medians fill missing values so absent data lands mid-pack rather than last
+            missing = np.isnan(values)
+            values[missing] = np.broadcast_to(_column_medians(values), values.shape)[missing]
+            ranks = _percentile_matrix(values)
+            for row, member in enumerate(members):
+                percentiles[member] = ranks[row]
 
         enriched: Dict[str, List[FundamentalSnapshot]] = {}
         for symbol, snaps in fundamentals.items():
+            if inplace:
+                for idx, snap in enumerate(snaps):
+                    snap.metrics.update(zip(output_keys, percentiles[(symbol, idx)].tolist()))
+                enriched[symbol] = snaps
+                continue
             enriched_snaps: List[FundamentalSnapshot] = []
-            for snap in snaps:
+            for idx, snap in enumerate(snaps):
                 metrics = dict(snap.metrics)
-                for output_key, source_key in MOAT_OUTPUT_KEYS.items():
-                    year = snap.period
-                    fallback = medians.get(year, {}).get(output_key, 0.0)
-                    value = metrics.get(source_key)
-                    with_fallback = value if value is not None else fallback
-                    percentile = _percentile_rank(with_fallback, peers.get(year, {}).get(output_key, []))
-                    metrics[output_key] = percentile
+                metrics.update(zip(output_keys, percentiles[(symbol, idx)].tolist()))
                 enriched_snaps.append(
                     FundamentalSnapshot(
                         period=snap.period,
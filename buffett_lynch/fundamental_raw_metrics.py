@@ -16,12 +16,40 @@ import numpy as np
 from .models import FundamentalSnapshot
 
 
+# ROIC trends use at most the last five years
+_TREND_WINDOW = 5
+
+
+def _slope_weights(n: int) -> np.ndarray:
+    """Weights ``w`` with ``w @ y`` equal to the OLS slope of ``y`` against ``0..n-1``.
+
+    With centred x the intercept drops out: slope = sum(x_c * y) / sum(x_c ** 2).
+    """
+    centred = np.arange(n) - (n - 1) / 2.0
+    return centred / np.dot(centred, centred)
+
+
+# e.g. n=5: [-2, -1, 0, 1, 2] / 10
+_SLOPE_WEIGHTS = {n: _slope_weights(n) for n in range(2, _TREND_WINDOW + 1)}
+
+
 def _linear_trend(values: List[float]) -> float:
-    if len(values) < 2:
+    """Least-squares slope of ``values`` against ``0..n-1``."""
+    n = len(values)
+    if n < 2:
         return 0.0
-    x = np.arange(len(values))
-    slope, _ = np.polyfit(x, values, 1)
-    return float(slope)
+    weights = _SLOPE_WEIGHTS.get(n)
+    if weights is None:
+        weights = _slope_weights(n)
+    return float(np.dot(weights, values))
+
+
+def _sales_ratio_pct(numerators: np.ndarray, revenues: np.ndarray) -> np.ndarray:
+    """``numerator / revenue * 100`` per snapshot; NaN where either input is missing or revenue is 0."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = numerators / revenues * 100.0
+    ratios[revenues == 0] = np.nan
+    return ratios
 
 
 @dataclass
@@ -29,39 +57,47 @@ class FundamentalRawMetrics:
     """Derive raw moat components from fundamental inputs."""
 
     def enrich_moat_raw_metrics(
-        self, fundamentals: Mapping[str, List[FundamentalSnapshot]]
+        self, fundamentals: Mapping[str, List[FundamentalSnapshot]], inplace: bool = False
     ) -> Dict[str, List[FundamentalSnapshot]]:
+        """Attach raw moat inputs; with ``inplace`` the given snapshots' metrics are updated."""
+        snapshots = [snap for snaps in fundamentals.values() for snap in snaps]
+        all_metrics = [snap.metrics if inplace else dict(snap.metrics) for snap in snapshots]
+
+        # Sales ratios for the whole universe as column arrays; ``None`` inputs become NaN
+        def column(key: str) -> np.ndarray:
+            return np.array([metrics.get(key) for metrics in all_metrics], dtype=float)
+
+        revenues = column("revenue")
+        gross_margins = _sales_ratio_pct(column("gross_profit"), revenues).tolist()
+        rd_sales = _sales_ratio_pct(column("r_and_d_expense"), revenues).tolist()
+
+        for metrics, gross_margin, rd_ratio in zip(all_metrics, gross_margins, rd_sales):
+            # NaN != NaN: only ratios with both inputs present are attached
+            if gross_margin == gross_margin:
+                metrics["gross_margin_pct"] = gross_margin
+            if rd_ratio == rd_ratio:
+                metrics["rd_sales_pct"] = rd_ratio
+
+            roic_history = [float(v) for v in metrics.get("roic_history") or [] if v is not None]
+            if len(roic_history) >= 2:
+                trend_window = roic_history[-_TREND_WINDOW:]
+                metrics["roic_trend_pct"] = _linear_trend(trend_window)
+
+        if inplace:
+            return dict(fundamentals)
+
         enriched: Dict[str, List[FundamentalSnapshot]] = {}
+        metrics_iter = iter(all_metrics)
         for symbol, snaps in fundamentals.items():
-            enriched_snaps: List[FundamentalSnapshot] = []
-            for snap in snaps:
-                metrics = dict(snap.metrics)
-
-                gross_profit = metrics.get("gross_profit")
-                revenue = metrics.get("revenue")
-                if gross_profit is not None and revenue:
-                    metrics["gross_margin_pct"] = float(gross_profit) / float(revenue) * 100.0
-
-                rd_expense = metrics.get("r_and_d_expense")
-                if rd_expense is not None and revenue:
-                    metrics["rd_sales_pct"] = float(rd_expense) / float(revenue) * 100.0
-
-                roic_history = [float(v) for v in metrics.get("roic_history") or [] if v is not None]
-                if len(roic_history) >= 2:
-                    trend_window = roic_history[-5:]
-                    metrics["roic_trend_pct"] = _linear_trend(trend_window)
-
-                enriched_snaps.append(
-                    FundamentalSnapshot(
-                        period=snap.period,
-                        market_cap=snap.market_cap,
-                        sector=snap.sector,
-                        metrics=metrics,
-                    )
+            enriched[symbol] = [
+                FundamentalSnapshot(
+                    period=snap.period,
+                    market_cap=snap.market_cap,
+                    sector=snap.sector,
+                    metrics=next(metrics_iter),
                 )
-            enriched[symbol] = enriched_snaps
-
+                for snap in snaps
+            ]
         return enriched
 
-
 __all__ = ["FundamentalRawMetrics"]
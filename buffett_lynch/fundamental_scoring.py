@@ -2,15 +2,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Callable, Dict, List
+from typing import Callable, Dict, List, Sequence, Tuple
 
-from .models import FundamentalSnapshot, ScoredCompany
+import numpy as np
+
+from .config import ScoringConfig
+from .models import FundamentalPanel, FundamentalSnapshot, ScoredCompany
 
 
 MEDIAN_PERCENTILE = 0.5
 
+# TotalScore weights in summation order: quality, growth, moat, value, risk.
+TOTAL_WEIGHTS = np.array([0.35, 0.20, 0.20, 0.15, 0.10], dtype=np.float64)
+
 
-@dataclass
+@dataclass(slots=True)
 class ScoringRules:
     quality: Callable[[FundamentalSnapshot], float]
     value: Callable[[FundamentalSnapshot], float]
@@ -20,18 +26,22 @@ class ScoringRules:
 
 
 class FundamentalScorer:
-    def __init__(self, rules: ScoringRules):
+    def __init__(self, rules: ScoringRules, weights: Sequence[float] | None = None):
         self.rules = rules
+        self._weights = TOTAL_WEIGHTS if weights is None else np.asarray(weights, dtype=np.float64)
+        if self._weights.shape != TOTAL_WEIGHTS.shape:
+            raise ValueError(f"Expected {len(TOTAL_WEIGHTS)} total-score weights, got {self._weights.shape}")
 
     def score(self, symbol: str, fundamentals: List[FundamentalSnapshot]) -> List[ScoredCompany]:
         scored: List[ScoredCompany] = []
+        w_quality, w_growth, w_moat, w_value, w_risk = self._weights.tolist()
         for snap in fundamentals:
             quality = self.rules.quality(snap)
             value = self.rules.value(snap)
             growth = self.rules.growth(snap)
             moat = self.rules.moat(snap)
             risk = self.rules.risk(snap)
-            total = 0.35 * quality + 0.20 * growth + 0.20 * moat + 0.15 * value + 0.10 * risk
+            total = w_quality * quality + w_growth * growth + w_moat * moat + w_value * value + w_risk * risk
             scored.append(
                 ScoredCompany(
                     symbol=symbol,
@@ -48,8 +58,73 @@ class FundamentalScorer:
             )
         return scored
 
+    def score_batch(self, symbol: str, fundamentals: Sequence[FundamentalSnapshot]) -> List[ScoredCompany]:
+        """Score ``fundamentals`` column-wise when every rule has an array form.
+
+        The built-in rules are evaluated once over the whole batch; custom
+        callables fall back to :meth:`score`.
+        """
+
+        if not fundamentals or self._batch_rules() is None:
+            return self.score(symbol, list(fundamentals))
+        return self.score_panel(FundamentalPanel.from_snapshots(fundamentals, symbol, _INPUT_KEYS))
+
+    def score_panel(self, panel: FundamentalPanel) -> List[ScoredCompany]:
+        """Score every row of ``panel`` with the array forms of the rules."""
+
+        batch_rules = self._batch_rules()
+        if batch_rules is None:
+            raise ValueError("score_panel requires the built-in scoring rules")
+        cols = scoring_inputs(panel)
+        quality, value, growth, moat, risk = (rule(cols) for rule in batch_rules)
+        total = _weighted_total((quality, growth, moat, value, risk), self._weights)
+        return [
+            ScoredCompany(
+                symbol=symbol,
+                quality=q,
+                value=v,
+                growth=g,
+                moat=m,
+                risk=r,
+                total=t,
+                sector=sector,
+                market_cap=market_cap,
+                period=period,
+            )
+            for symbol, sector, market_cap, period, q, v, g, m, r, t in zip(
+                panel.symbols.tolist(),
+                panel.sectors.tolist(),
+                panel.market_caps.tolist(),
+                panel.periods.tolist(),
+                quality.tolist(),
+                value.tolist(),
+                growth.tolist(),
+                moat.tolist(),
+                risk.tolist(),
+                total.tolist(),
+            )
+        ]
+
+    def _batch_rules(self):
+        rules = self.rules
+        batch_rules = [
+            _BATCH_RULES.get(rule)
+            for rule in (rules.quality, rules.value, rules.growth, rules.moat, rules.risk)
+        ]
+        return None if None in batch_rules else batch_rules
 
-__all__ = ["FundamentalScorer", "ScoringRules"]
+
+def _metric(metrics: Dict[str, float], key: str, default: float = 0.0) -> float:
+    """Return ``metrics[key]``, or ``default`` when it is absent, ``None`` or NaN.
+
+    Matches :meth:`FundamentalPanel.column`, which stores ``None`` as NaN, so the
+    scalar and batch scoring paths agree on gaps.
+    """
+
+    value = metrics.get(key)
+    if value is None or value != value:
+        return default
+    return value
 
 
 def _metric_with_median(metrics: Dict[str, float], *keys: str, default: float = MEDIAN_PERCENTILE) -> float:
@@ -57,12 +132,12 @@ def _metric_with_median(metrics: Dict[str, float], *keys: str, default: float =
 
     Percentile-based inputs should not default to 0.0 because missing data would
     distort scoring. The median percentile (0.5) is used when a component is
-    absent or explicitly set to ``None``.
+    absent, explicitly set to ``None`` or NaN.
     """
 
     for key in keys:
         value = metrics.get(key)
-        if value is not None:
+        if value is not None and value == value:
             return value
     return default
 
@@ -75,8 +150,8 @@ def growth_score(snapshot: FundamentalSnapshot) -> float:
     variability; higher variability reduces the resulting GrowthScore.
     """
 
-    growth_pct = snapshot.metrics.get("growth", 0.0)
-    volatility_penalty = snapshot.metrics.get("revenue_volatility_penalty", 0.0)
+    growth_pct = _metric(snapshot.metrics, "growth")
+    volatility_penalty = _metric(snapshot.metrics, "revenue_volatility_penalty")
 
     return max(0.0, growth_pct - volatility_penalty)
 
@@ -89,8 +164,8 @@ def quality_score(snapshot: FundamentalSnapshot) -> float:
     ROIC level.
     """
 
-    roe_pct = snapshot.metrics.get("roe", 0.0)
-    roic_trend_pct = snapshot.metrics.get("roic_trend_pct", 0.0)
+    roe_pct = _metric(snapshot.metrics, "roe")
+    roic_trend_pct = _metric(snapshot.metrics, "roic_trend_pct")
 
     # Keep the ROE-driven profile while explicitly rewarding a rising ROIC trend.
     return 0.9 * roe_pct + 0.1 * roic_trend_pct
@@ -112,5 +187,141 @@ def moat_score(snapshot: FundamentalSnapshot) -> float:
     return 0.4 * gross_margin_pct + 0.3 * rd_sales_pct + 0.3 * roic_trend_pct
 
 
-__all__.extend(["growth_score", "moat_score", "quality_score"])
+def value_score(snapshot: FundamentalSnapshot) -> float:
+    """Compute ValueScore as the inverse of the P/E multiple (cheaper is better)."""
+
+    return max(0.0, 100.0 - _metric(snapshot.metrics, "pe"))
+
+
+def risk_score(snapshot: FundamentalSnapshot) -> float:
+    """Compute RiskScore as the inverse of the beta-derived volatility."""
+
+    return max(0.0, 100.0 - _metric(snapshot.metrics, "volatility"))
+
+
+# Scoring inputs resolved once per panel: name -> (source keys by priority, fallback).
+_SCORING_INPUTS: Dict[str, Tuple[Tuple[str, ...], float]] = {
+    "growth": (("growth",), 0.0),
+    "revenue_volatility_penalty": (("revenue_volatility_penalty",), 0.0),
+    "roe": (("roe",), 0.0),
+    "roic_trend_pct": (("roic_trend_pct",), 0.0),
+    "gross_margin": (("gross_margin_percentile", "gross_margin_pct"), MEDIAN_PERCENTILE),
+    "rd_sales": (("r_and_d_to_sales_percentile", "rd_sales_pct"), MEDIAN_PERCENTILE),
+    "roic_trend": (("roic_trend_percentile", "roic_trend_pct"), MEDIAN_PERCENTILE),
+    "pe": (("pe",), 0.0),
+    "volatility": (("volatility",), 0.0),
+}
+KEY_INDEX: Dict[str, int] = {name: i for i, name in enumerate(_SCORING_INPUTS)}
+# Snapshot metric keys the batch rules read; panels are built over these only
+_INPUT_KEYS: Tuple[str, ...] = tuple(dict.fromkeys(key for keys, _ in _SCORING_INPUTS.values() for key in keys))
+
+
+def scoring_inputs(panel: FundamentalPanel) -> np.ndarray:
+    """Return the ``(N, len(KEY_INDEX))`` input matrix with fallbacks already applied.
+
+    Columns are contiguous (Fortran order) so each ``cols[:, KEY_INDEX[name]]``
+    is a contiguous load.
+    """
+
+    cols = np.empty((len(panel), len(KEY_INDEX)), dtype=np.float64, order="F")
+    for name, (keys, default) in _SCORING_INPUTS.items():
+        cols[:, KEY_INDEX[name]] = panel.column(*keys, default=default)
+    return cols
+
+
+def growth_scores(cols: np.ndarray) -> np.ndarray:
+    """Array form of :func:`growth_score` over :func:`scoring_inputs` columns."""
+
+    return np.fmax(0.0, cols[:, KEY_INDEX["growth"]] - cols[:, KEY_INDEX["revenue_volatility_penalty"]])
+
+
+def quality_scores(cols: np.ndarray) -> np.ndarray:
+    """Array form of :func:`quality_score` over :func:`scoring_inputs` columns."""
+
+    return 0.9 * cols[:, KEY_INDEX["roe"]] + 0.1 * cols[:, KEY_INDEX["roic_trend_pct"]]
+
+
+def moat_scores(cols: np.ndarray) -> np.ndarray:
+    """Array form of :func:`moat_score` over :func:`scoring_inputs` columns."""
+
+    return (
+        0.4 * cols[:, KEY_INDEX["gross_margin"]]
+        + 0.3 * cols[:, KEY_INDEX["rd_sales"]]
+        + 0.3 * cols[:, KEY_INDEX["roic_trend"]]
+    )
+
+
+def value_scores(cols: np.ndarray) -> np.ndarray:
+    """Array form of :func:`value_score` over :func:`scoring_inputs` columns."""
+
+    return np.fmax(0.0, 100.0 - cols[:, KEY_INDEX["pe"]])
+
+
+def risk_scores(cols: np.ndarray) -> np.ndarray:
+    """Array form of :func:`risk_score` over :func:`scoring_inputs` columns."""
+
+    return np.fmax(0.0, 100.0 - cols[:, KEY_INDEX["volatility"]])
+
+
+def _weighted_total(components: Sequence[np.ndarray], weights: np.ndarray) -> np.ndarray:
+    """Accumulate ``components`` against ``weights`` in one buffer.
+
+    Summed term by term rather than as ``components @ weights`` so totals are
+    bit-identical to :meth:`FundamentalScorer.score`; a BLAS dot product
+    rounds differently and can reorder tied rankings.
+    """
 
+    total = np.multiply(components[0], weights[0])
+    scratch = np.empty_like(total)
+    for component, weight in zip(components[1:], weights[1:]):
+        total += np.multiply(component, weight, out=scratch)
+    return total
+
+
+# Scalar rule -> array counterpart used by ``FundamentalScorer.score_batch``.
+_BATCH_RULES: Dict[Callable[[FundamentalSnapshot], float], Callable[[np.ndarray], np.ndarray]] = {
+    growth_score: growth_scores,
+    quality_score: quality_scores,
+    moat_score: moat_scores,
+    value_score: value_scores,
+    risk_score: risk_scores,
+}
+
+
+DEFAULT_RULES = ScoringRules(
+    quality=quality_score,
+    value=value_score,
+    growth=growth_score,
+    moat=moat_score,
+    risk=risk_score,
+)
+
+
+def make_scorer(config: ScoringConfig | None = None, rules: ScoringRules | None = None) -> FundamentalScorer:
+    """Build a scorer for a strategy variant from its weight config (built-in rules by default)."""
+
+    weights = None
+    if config is not None:
+        weights = [config.quality, config.growth, config.moat, config.value, config.risk]
+    return FundamentalScorer(rules or DEFAULT_RULES, weights)
+
+
+__all__ = [
+    "DEFAULT_RULES",
+    "FundamentalScorer",
+    "KEY_INDEX",
+    "ScoringRules",
+    "TOTAL_WEIGHTS",
+    "growth_score",
+    "growth_scores",
+    "make_scorer",
+    "moat_score",
+    "moat_scores",
+    "quality_score",
+    "quality_scores",
+    "risk_score",
+    "risk_scores",
+    "scoring_inputs",
+    "value_score",
+    "value_scores",
+]
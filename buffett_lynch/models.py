@@ -1,15 +1,18 @@
 """Core data structures shared across modules."""
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Sequence
+from numbers import Real
+from typing import Dict, Iterable, List, Optional, Sequence, Union
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class PriceBar:
     date: str  # YYYY-MM-DD
     close: float
 
 
-@dataclass
+@dataclass(slots=True)
 class FundamentalSnapshot:
     period: str  # YYYY
     market_cap: float
@@ -18,6 +21,69 @@ class FundamentalSnapshot:
 
 
 @dataclass
+class FundamentalPanel:
+    """Column-wise view of many snapshots; missing metrics are stored as NaN."""
+
+    symbols: np.ndarray
+    periods: np.ndarray
+    market_caps: np.ndarray
+    sectors: np.ndarray
+    metrics: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.periods)
+
+    @classmethod
+    def from_snapshots(
+        cls,
+        snapshots: Sequence[FundamentalSnapshot],
+        symbols: Union[str, Sequence[str]] = "",
+        keys: Optional[Iterable[str]] = None,
+    ) -> "FundamentalPanel":
+        """Build a panel over ``keys`` (default: every metric key present).
+
+        Only scalar metrics become columns; a key with any non-numeric value,
+        such as the list-valued ``roic_history``, is left out.
+        """
+        n = len(snapshots)
+        if keys is None:
+            keys = dict.fromkeys(key for snap in snapshots for key in snap.metrics)
+        metrics = {}
+        for key in keys:
+            values = [snap.metrics.get(key) for snap in snapshots]
+            if not all(v is None or isinstance(v, Real) for v in values):
+                continue
+            metrics[key] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        if isinstance(symbols, str):
+            symbols = [symbols] * n
+        panel = cls(
+            symbols=np.array(symbols, dtype=object),
+            periods=np.array([snap.period for snap in snapshots], dtype=object),
+            market_caps=np.array([snap.market_cap for snap in snapshots], dtype=np.float64),
+            sectors=np.array([snap.sector for snap in snapshots], dtype=object),
+            metrics=metrics,
+        )
+        # Panels are shared through loader caches, so their columns are read-only
+        for array in (panel.symbols, panel.periods, panel.market_caps, panel.sectors, *metrics.values()):
+            array.setflags(write=False)
+        return panel
+
+    def column(self, *keys: str, default: float = 0.0) -> np.ndarray:
+        """Return the first present of ``keys`` per row, else ``default``."""
+
+        out = np.full(len(self), default, dtype=np.float64)
+        missing = np.ones(len(self), dtype=bool)
+        for key in keys:
+            values = self.metrics.get(key)
+            if values is None:
+                continue
+            take = missing & ~np.isnan(values)
+            out[take] = values[take]
+            missing &= ~take
+        return out
+
+
+@dataclass(slots=True)
 class ScoredCompany:
     symbol: str
     quality: float
@@ -31,7 +97,7 @@ class ScoredCompany:
     period: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     symbol: str
     quantity: float
@@ -50,7 +116,7 @@ class PortfolioState:
     exposure: Dict[str, float] = field(default_factory=dict)  # bull/bear exposure percentages
 
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     symbol: str
     action: str  # BUY or SELL
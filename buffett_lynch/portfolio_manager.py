@@ -2,13 +2,23 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from operator import attrgetter
 from typing import Dict, List, Tuple
 
+import numpy as np
+
 from .config import PortfolioConfig, RebalancingConfig
 from .models import Order, Position, ScoredCompany
+from .ranking import top_indices
+
+# Shared zero-weight stand-in for targets that are not held yet; never mutated
+_NO_POSITION = Position("", 0.0, "", 0.0, 0.0)
+_TOTAL = attrgetter("total")
+_WEIGHT = attrgetter("weight")
+_QUALITY = attrgetter("quality")
 
 
-@dataclass
+@dataclass(slots=True)
 class TargetAllocation:
     symbol: str
     weight: float
@@ -21,34 +31,31 @@ class PortfolioManager:
         self.rebalance_cfg = rebalance_cfg
 
     def pick_top(self, scored: List[ScoredCompany]) -> List[ScoredCompany]:
-        universe_sorted = sorted(scored, key=lambda s: s.total, reverse=True)
-        return universe_sorted[: self.portfolio_cfg.top_n]
+        """Return the ``top_n`` companies by total score; ties keep their input order."""
+        totals = np.fromiter(map(_TOTAL, scored), dtype=np.float64, count=len(scored))
+        return [scored[i] for i in top_indices(totals, self.portfolio_cfg.top_n).tolist()]
 
     def build_weights(self, picks: List[ScoredCompany]) -> List[TargetAllocation]:
-        quality_sum = sum(p.quality for p in picks) or 1.0
-        raw = [TargetAllocation(symbol=p.symbol, weight=p.quality / quality_sum, score=p) for p in picks]
-        constrained = self._apply_constraints(raw)
-        return constrained
+        quality = np.fromiter(map(_QUALITY, picks), dtype=np.float64, count=len(picks))
+        # Sequential sums keep the weights bit-identical to the original per-row loops
+        quality_sum = sum(quality.tolist()) or 1.0
+        sector_codes: Dict[str, int] = {}
+        sector_ids = np.fromiter(
+            (sector_codes.setdefault(p.sector, len(sector_codes)) for p in picks),
+            dtype=np.intp,
+            count=len(picks),
+        )
+        weights = self._apply_constraints(quality / quality_sum, sector_ids).tolist()
+        total = sum(weights) or 1.0
+        return [TargetAllocation(symbol=p.symbol, weight=w / total, score=p) for p, w in zip(picks, weights)]
 
-    def _apply_constraints(self, allocations: List[TargetAllocation]) -> List[TargetAllocation]:
+    def _apply_constraints(self, weights: np.ndarray, sector_ids: np.ndarray) -> np.ndarray:
+        """Sector-cap then clamp ``weights`` in one array pipeline; renormalizing is left to the caller."""
         cfg = self.rebalance_cfg
-        # Sector caps
-        sector_weight: Dict[str, float] = {}
-        for alloc in allocations:
-            sector_weight.setdefault(alloc.score.sector, 0.0)
-            sector_weight[alloc.score.sector] += alloc.weight
-        for alloc in allocations:
-            if sector_weight[alloc.score.sector] > cfg.max_sector_weight:
-                scale = cfg.max_sector_weight / sector_weight[alloc.score.sector]
-                alloc.weight *= scale
-        # Clamp min and max
-        for alloc in allocations:
-            alloc.weight = max(cfg.min_position, min(cfg.max_position, alloc.weight))
-        # Renormalize
-        total = sum(a.weight for a in allocations) or 1.0
-        for alloc in allocations:
-            alloc.weight /= total
-        return allocations
+        sector_weight = np.bincount(sector_ids, weights=weights)
+        over = sector_weight > cfg.max_sector_weight
+        scale = np.where(over, cfg.max_sector_weight / np.where(over, sector_weight, 1.0), 1.0)
+        return np.maximum(cfg.min_position, np.minimum(cfg.max_position, weights * scale[sector_ids]))
 
     def rebalance_orders(self, current: Dict[str, Position], targets: List[TargetAllocation],
                          prices: Dict[str, float], currency: str) -> List[Order]:
@@ -57,20 +64,22 @@ class PortfolioManager:
         for symbol, pos in current.items():
             if symbol not in target_map:
                 orders.append(Order(symbol, "SELL", pos.quantity, pos.currency, reason="Removed from target"))
-        for alloc in targets:
-            price = prices.get(alloc.symbol)
-            if price is None or price == 0:
-                continue
-            target_value = alloc.weight
-            current_value = current.get(
-                alloc.symbol, Position(alloc.symbol, 0.0, currency, 0.0, 0.0, "")
-            )
-            delta_value = target_value - current_value.weight
-            if abs(delta_value) < 1e-6:
-                continue
-            quantity = delta_value / price
+        symbols = [t.symbol for t in targets]
+        price_list = [prices.get(symbol) for symbol in symbols]
+        price_arr = np.array([np.nan if p is None else p for p in price_list], dtype=np.float64)
+        target_w = np.fromiter(map(_WEIGHT, targets), dtype=np.float64, count=len(targets))
+        current_w = np.fromiter(
+            (current.get(symbol, _NO_POSITION).weight for symbol in symbols),
+            dtype=np.float64,
+            count=len(targets),
+        )
+        deltas = target_w - current_w
+        mask = ~np.isnan(price_arr) & (price_arr != 0) & (np.abs(deltas) >= 1e-6)
+        quantities = deltas / np.where(mask, price_arr, 1.0)
+        for i in np.flatnonzero(mask).tolist():
+            quantity = quantities[i].item()
             action = "BUY" if quantity > 0 else "SELL"
-            orders.append(Order(alloc.symbol, action, abs(quantity), currency, reason="Rebalance", price=price))
+            orders.append(Order(symbols[i], action, abs(quantity), currency, reason="Rebalance", price=price_list[i]))
         return orders
 
 
@@ -0,0 +1,26 @@
+"""Partial top-N selection shared by universe construction and portfolio picks."""
+from __future__ import annotations
+
+import numpy as np
+
+
+def top_indices(values: np.ndarray, n: int) -> np.ndarray:
+    """Indices of the ``n`` largest ``values``, descending.
+
+    Equivalent to ``sorted(range(len(values)), key=values.__getitem__, reverse=True)[:n]``:
+    ties keep their input order, as with a stable sort, but only the selected
+    rows are sorted.
+    """
+    if n <= 0:
+        return np.empty(0, dtype=np.intp)
+    if len(values) > n:
+        kth = np.partition(values, len(values) - n)[len(values) - n]
+        above = np.flatnonzero(values > kth)
+        ties = np.flatnonzero(values == kth)[: n - len(above)]
+        chosen = np.sort(np.concatenate((above, ties)))
+    else:
+        chosen = np.arange(len(values))
+    return chosen[np.argsort(-values[chosen], kind="stable")]
+
+
+__all__ = ["top_indices"]
@@ -8,7 +8,7 @@ from .config import StrategyConfig
 from .currency_engine import CurrencyEngine
 from .data_loader import DataLoader
 from .execution_engine import ExecutionEngine
-from .fundamental_scoring import FundamentalScorer, ScoringRules
+from .fundamental_scoring import ScoringRules, make_scorer
 from .models import PriceBar, ScoredCompany
 from .portfolio_manager import PortfolioManager
 from .universe_builder import UniverseBuilder
@@ -18,7 +18,7 @@ class BuffettLynchStrategy:
     def __init__(self, loader: DataLoader, scoring_rules: ScoringRules, config: StrategyConfig = StrategyConfig()):
         self.loader = loader
         self.config = config
-        self.scorer = FundamentalScorer(scoring_rules)
+        self.scorer = make_scorer(config.scoring, scoring_rules)
         self.universe = UniverseBuilder(loader)
         self.portfolio_manager = PortfolioManager(config.portfolio, config.rebalancing)
         self.execution = ExecutionEngine(config.portfolio)
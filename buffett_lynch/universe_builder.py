@@ -6,6 +6,9 @@ from typing import Dict, Iterable, List
 
 from .data_loader import DataLoader
 from .models import FundamentalSnapshot
+from .ranking import top_indices
+
+_TOP_N = 100
 
 
 class UniverseBuilder:
@@ -16,16 +19,10 @@ class UniverseBuilder:
         """Return year->top 100 symbols by market cap using index membership fundamentals."""
         membership = self.loader.load_index_members(index)
         yearly_top: Dict[str, List[str]] = {}
-        for year, symbols in membership.items():
-            scored = []
-            for symbol in symbols:
-                fundamentals = [f for f in self.loader.load_fundamentals(symbol) if f.period == year]
-                if not fundamentals:
-                    continue
-                snap = fundamentals[-1]
-                scored.append((symbol, snap.market_cap))
-            top = [s for s, _ in sorted(scored, key=lambda t: t[1], reverse=True)[:100]]
-            yearly_top[year] = top
+        for year in membership:
+            panel = self.loader.load_fundamental_panel(index, year)
+            order = top_indices(panel.market_caps, _TOP_N)
+            yearly_top[year] = panel.symbols[order].tolist()
         return yearly_top
 
 
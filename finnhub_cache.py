@@ -0,0 +1,68 @@
+"""On-disk cache for raw Finnhub JSON responses."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib import parse
+
+try:  # orjson is optional; the stdlib is the fallback
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _loads = json.loads
+
+# Annual fundamentals barely change, so responses are reused for 90 days by default
+DEFAULT_TTL = 90 * 24 * 3600
+
+
+class FileCache:
+    """JSON file per request under ``root``, each entry carrying its own TTL.
+
+    ``BL_CACHE_DIR`` relocates the store (``finnhub/`` inside it), ``BL_NO_CACHE``
+    disables it and ``FINNHUB_CACHE_TTL`` overrides the TTL in seconds.
+    """
+
+    def __init__(self, root: Optional[Path] = None, ttl: Optional[float] = None):
+        if root is None:
+            root = Path(os.environ.get("BL_CACHE_DIR") or "reports/cache") / "finnhub"
+        self.root = root
+        self.ttl = float(os.environ.get("FINNHUB_CACHE_TTL", DEFAULT_TTL)) if ttl is None else ttl
+        self.enabled = not os.environ.get("BL_NO_CACHE")
+
+    @staticmethod
+    def key(path: str, params: Dict[str, str]) -> str:
+        return hashlib.md5(f"{path}?{parse.urlencode(sorted(params.items()))}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+        try:
+            entry = _loads((self.root / f"{key}.json").read_bytes())
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("ts", 0) > entry.get("ttl", self.ttl):
+            return None
+        return entry.get("data")
+
+    def set(self, key: str, value: Dict, ttl: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / f"{key}.json"
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        entry = {"ts": time.time(), "ttl": self.ttl if ttl is None else ttl, "data": value}
+        tmp_path.write_bytes(_dumps(entry))
+        os.replace(tmp_path, path)
+
+
+__all__ = ["DEFAULT_TTL", "FileCache"]
@@ -1,9 +1,27 @@
 import json
 import os
+import re
 import sys
-from collections import Counter, defaultdict
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Dict, List, Tuple
-from urllib import parse, request, error
+from urllib import parse
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from finnhub_cache import FileCache
+
+try:  # orjson parses bytes directly and is much faster on the large financials payload
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+
+    def _loads(data: bytes):
+        return json.loads(data.decode("utf-8"))
 
 
 SYMBOLS = ["AAPL", "MSFT", "AMZN", "META", "TSLA", "JNJ", "GE", "IBM", "ORCL", "XOM"]
@@ -16,22 +34,59 @@ METRICS = [
     "sector",
     "market_cap",
 ]
+# Array positions, resolved once instead of per lookup
+_YEAR_IDX: Dict[int, int] = {year: i for i, year in enumerate(YEARS)}
+_METRIC_IDX: Dict[str, int] = {metric: i for i, metric in enumerate(METRICS)}
 BASE_URL = "https://finnhub.io/api/v1"
+# Concurrent symbols in flight; 5 symbols x up to 3 calls stays well under Finnhub's 30 req/s free tier
+_MAX_WORKERS = 5
+_CACHE = FileCache()
+# One keep-alive session so every call after the first skips the TCP/TLS handshake
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=_MAX_WORKERS * 2))
+
+# Report-key substrings per metric family, compiled once into one alternation each
+_PATTERNS: Dict[str, "re.Pattern[str]"] = {
+    name: re.compile("|".join(map(re.escape, candidates)))
+    for name, candidates in {
+        "revenue": ["revenue"],
+        "gross": ["grossprofit", "gross profit", "gross"],
+        "rnd": ["research", "r&d", "rnd", "r and d"],
+        "operating": ["operatingincome", "operating income", "ebit"],
+        "debt": ["totaldebt", "longtermdebt", "debt"],
+        "assets": ["totalassets", "investedcapital", "total asset", "invested capital"],
+    }.items()
+}
+# Union of every family: keys that fail it can never affect coverage
+_NEEDLE_RE = re.compile("|".join(pattern.pattern for pattern in _PATTERNS.values()))
+# One bit per family so a single walk over a year's keys finds them all
+_BITS: Dict[str, int] = {name: 1 << i for i, name in enumerate(_PATTERNS)}
+_FAMILY_BITS: List[Tuple["re.Pattern[str]", int]] = [(_PATTERNS[name], bit) for name, bit in _BITS.items()]
+_ALL_BITS = (1 << len(_PATTERNS)) - 1
 
 
 def _fetch_json(path: str, params: Dict[str, str], api_key: str) -> Dict:
-    query = parse.urlencode({**params, "token": api_key})
-    url = f"{BASE_URL}{path}?{query}"
+    # The key leaves out the token so cached responses survive key rotation
+    cache_key = _CACHE.key(path, params)
+    cached = _CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    url = f"{BASE_URL}{path}"
+    # Warnings name the request without the token
+    label = f"{url}?{parse.urlencode(params)}"
     try:
-        with request.urlopen(url, timeout=15) as resp:  # type: ignore[arg-type]
-            data = resp.read()
-            return json.loads(data.decode("utf-8"))
-    except error.HTTPError as exc:  # pragma: no cover - network dependent
-        print(f"[WARN] HTTP error for {url}: {exc}", file=sys.stderr)
-    except error.URLError as exc:  # pragma: no cover - network dependent
-        print(f"[WARN] URL error for {url}: {exc}", file=sys.stderr)
+        resp = _SESSION.get(url, params={**params, "token": api_key}, timeout=15)
+        resp.raise_for_status()
+        payload = _loads(resp.content)
+        _CACHE.set(cache_key, payload)
+        return payload
+    except requests.HTTPError as exc:  # pragma: no cover - network dependent
+        print(f"[WARN] HTTP error for {label}: {exc}", file=sys.stderr)
+    except requests.RequestException as exc:  # pragma: no cover - network dependent
+        print(f"[WARN] URL error for {label}: {exc}", file=sys.stderr)
     except Exception as exc:  # pragma: no cover - defensive
-        print(f"[WARN] Failed to fetch {url}: {exc}", file=sys.stderr)
+        print(f"[WARN] Failed to fetch {label}: {exc}", file=sys.stderr)
     return {}
 
 
@@ -45,100 +100,86 @@ def _extract_year(entry: Dict) -> int:
     return -1
 
 
-def _extract_report_values(entry: Dict) -> Dict[str, float]:
-    values: Dict[str, float] = {}
+def _scan_report(entry: Dict) -> int:
+    """Bitmask of the metric families (see ``_BITS``) named by any valued item in ``entry``'s report."""
+    mask = 0
+    needle = _NEEDLE_RE.search
     report = entry.get("report", {})
     for section in report.values():
         if not isinstance(section, list):
             continue
         for item in section:
-            val = item.get("value")
-            if val is None:
+            if item.get("value") is None:
                 continue
             for key in (item.get("concept"), item.get("label")):
-                if key:
-                    values[key.lower()] = val
-    return values
-
-
-def _first_match(values: Dict[str, float], candidates: List[str]) -> bool:
-    for key in values:
-        for candidate in candidates:
-            if candidate in key:
-                return True
-    return False
-
-
-def _collect_symbol_year_metrics(api_key: str, symbol: str) -> Dict[int, Dict[str, bool]]:
-    coverage: Dict[int, Dict[str, bool]] = {year: {metric: False for metric in METRICS} for year in YEARS}
+                if not key:
+                    continue
+                key = key.lower()
+                if not needle(key):
+                    continue
+                for pattern, bit in _FAMILY_BITS:
+                    if not mask & bit and pattern.search(key):
+                        mask |= bit
+                # Every family seen: the rest of the report cannot change the result
+                if mask == _ALL_BITS:
+                    return mask
+    return mask
+
+
+def _collect_symbol_year_metrics(api_key: str, symbol: str) -> np.ndarray:
+    """Return a ``(len(YEARS), len(METRICS))`` presence matrix for ``symbol``."""
+    coverage = np.zeros((len(YEARS), len(METRICS)), dtype=bool)
 
     financials = _fetch_json("/stock/financials-reported", {"symbol": symbol, "freq": "annual"}, api_key)
     metrics_data = _fetch_json("/stock/metric", {"symbol": symbol, "metric": "all"}, api_key)
-    profile_data = _fetch_json("/stock/profile2", {"symbol": symbol}, api_key)
 
-    metric_map: Dict[int, Dict[str, float]] = {}
+    # Family masks per YEARS row; reports for untested years are never scanned
+    masks = [0] * len(YEARS)
     if isinstance(financials, dict):
         for entry in financials.get("data", []) or []:
-            year = _extract_year(entry)
-            if year == -1:
+            row = _YEAR_IDX.get(_extract_year(entry))
+            if row is None:
                 continue
-            metric_map[year] = _extract_report_values(entry)
-
-    sector_present = bool(profile_data.get("finnhubIndustry") or metrics_data.get("metric", {}).get("sector"))
-    market_cap_present = bool(metrics_data.get("metric", {}).get("marketCapitalization"))
-
-    for year in YEARS:
-        year_vals = metric_map.get(year, {})
-        has_revenue = _first_match(year_vals, ["revenue"])
-        has_gross = _first_match(year_vals, ["grossprofit", "gross profit", "gross"])
-        has_rnd = _first_match(year_vals, ["research", "r&d", "rnd", "r and d"])
-        has_operating = _first_match(year_vals, ["operatingincome", "operating income", "ebit"])
-        has_debt = _first_match(year_vals, ["totaldebt", "longtermdebt", "debt"])
-        has_assets = _first_match(year_vals, ["totalassets", "investedcapital", "total asset", "invested capital"])
-
-        coverage[year]["revenue"] = has_revenue
-        coverage[year]["gross_profit"] = has_gross
-        coverage[year]["r_and_d_expense"] = has_rnd
-        coverage[year]["roic_inputs"] = has_operating and (has_assets or has_debt)
-        coverage[year]["sector"] = sector_present
-        coverage[year]["market_cap"] = market_cap_present
+            masks[row] = _scan_report(entry)
+
+    metric_block = metrics_data.get("metric", {})
+    coverage[:, _METRIC_IDX["market_cap"]] = bool(metric_block.get("marketCapitalization"))
+    sector_present = bool(metric_block.get("sector"))
+    if not sector_present:
+        # /stock/profile2 is only needed as the sector fallback
+        profile_data = _fetch_json("/stock/profile2", {"symbol": symbol}, api_key)
+        sector_present = bool(profile_data.get("finnhubIndustry"))
+    coverage[:, _METRIC_IDX["sector"]] = sector_present
+
+    for row, mask in enumerate(masks):
+        coverage[row, _METRIC_IDX["revenue"]] = mask & _BITS["revenue"]
+        coverage[row, _METRIC_IDX["gross_profit"]] = mask & _BITS["gross"]
+        coverage[row, _METRIC_IDX["r_and_d_expense"]] = mask & _BITS["rnd"]
+        coverage[row, _METRIC_IDX["roic_inputs"]] = mask & _BITS["operating"] and mask & (_BITS["assets"] | _BITS["debt"])
 
     return coverage
 
 
-def compute_completeness(coverage: Dict[str, Dict[int, Dict[str, bool]]]) -> Tuple[float, Dict[str, float], Dict[int, float], Dict[str, float]]:
-    total_combinations = len(SYMBOLS) * len(YEARS)
-    total_entries = total_combinations * len(METRICS)
-
-    metric_counts: Counter = Counter()
-    year_counts: Counter = Counter()
-    symbol_counts: Counter = Counter()
-
-    for symbol, year_map in coverage.items():
-        for year, metrics in year_map.items():
-            for metric, present in metrics.items():
-                if present:
-                    metric_counts[metric] += 1
-                    year_counts[year] += 1
-                    symbol_counts[symbol] += 1
-
-    overall = (sum(metric_counts.values()) / total_entries * 100) if total_entries else 0.0
-    metric_pct = {metric: (metric_counts.get(metric, 0) / total_combinations * 100) for metric in METRICS}
-    year_pct = {year: (year_counts.get(year, 0) / (len(SYMBOLS) * len(METRICS)) * 100) for year in YEARS}
-    symbol_pct = {symbol: (symbol_counts.get(symbol, 0) / (len(YEARS) * len(METRICS)) * 100) for symbol in SYMBOLS}
+def compute_completeness(coverage: np.ndarray) -> Tuple[float, Dict[str, float], Dict[int, float], Dict[str, float]]:
+    """Completeness percentages from a ``(symbols, years, metrics)`` presence array."""
+    if not coverage.size:
+        return 0.0, dict.fromkeys(METRICS, 0.0), dict.fromkeys(YEARS, 0.0), dict.fromkeys(SYMBOLS, 0.0)
+    overall = float(coverage.mean() * 100)
+    metric_pct = dict(zip(METRICS, (coverage.mean(axis=(0, 1)) * 100).tolist()))
+    year_pct = dict(zip(YEARS, (coverage.mean(axis=(0, 2)) * 100).tolist()))
+    symbol_pct = dict(zip(SYMBOLS, (coverage.mean(axis=(1, 2)) * 100).tolist()))
     return overall, metric_pct, year_pct, symbol_pct
 
 
-def _build_missing_maps(coverage: Dict[str, Dict[int, Dict[str, bool]]]):
+def _build_missing_maps(coverage: np.ndarray):
     missing_by_symbol: Dict[str, Dict[str, List[int]]] = {sym: defaultdict(list) for sym in SYMBOLS}
     missing_by_year: Dict[int, Dict[str, List[str]]] = {year: defaultdict(list) for year in YEARS}
 
-    for symbol, years_map in coverage.items():
-        for year, metrics in years_map.items():
-            for metric, present in metrics.items():
-                if not present:
-                    missing_by_symbol[symbol][metric].append(year)
-                    missing_by_year[year][metric].append(symbol)
+    # argwhere walks symbol, year, metric in order, so the lists stay sorted like the old loops
+    for s, y, m in np.argwhere(~coverage).tolist():
+        symbol, year, metric = SYMBOLS[s], YEARS[y], METRICS[m]
+        missing_by_symbol[symbol][metric].append(year)
+        missing_by_year[year][metric].append(symbol)
     return missing_by_symbol, missing_by_year
 
 
@@ -164,26 +205,31 @@ def _format_metric_line(name: str, pct: float) -> str:
     return line
 
 
-def print_report(overall: float, metric_pct: Dict[str, float], year_pct: Dict[int, float], offenders: List[str]) -> None:
+def format_report(overall: float, metric_pct: Dict[str, float], year_pct: Dict[int, float], offenders: List[str]) -> str:
     total_combinations = len(SYMBOLS) * len(YEARS)
-    print("================= FUNDAMENTAL COVERAGE REPORT =================")
-    print(f"Years tested: {', '.join(str(y) for y in YEARS)}")
-    print(f"Symbols tested: {len(SYMBOLS)}")
-    print(f"Overall dataset completeness: {overall:0.1f}%")
-    print(f"Total combinations: {total_combinations}")
-    print()
-    print("Metric completeness:")
-    for metric in METRICS:
-        print(_format_metric_line(metric, metric_pct.get(metric, 0.0)))
-    print()
-    print("Coverage by year:")
-    for year in YEARS:
-        print(f"{year}: {year_pct.get(year, 0.0):0.1f}%")
-    print()
-    print("Worst symbols:")
-    for line in offenders:
-        print(line)
-    print("===============================================================")
+    lines = [
+        "================= FUNDAMENTAL COVERAGE REPORT =================",
+        f"Years tested: {', '.join(str(y) for y in YEARS)}",
+        f"Symbols tested: {len(SYMBOLS)}",
+        f"Overall dataset completeness: {overall:0.1f}%",
+        f"Total combinations: {total_combinations}",
+        "",
+        "Metric completeness:",
+        *(_format_metric_line(metric, metric_pct.get(metric, 0.0)) for metric in METRICS),
+        "",
+        "Coverage by year:",
+        *(f"{year}: {year_pct.get(year, 0.0):0.1f}%" for year in YEARS),
+        "",
+        "Worst symbols:",
+        *offenders,
+        "===============================================================",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def print_report(overall: float, metric_pct: Dict[str, float], year_pct: Dict[int, float], offenders: List[str]) -> None:
+    # One write instead of a locked, possibly line-buffered write per line
+    sys.stdout.write(format_report(overall, metric_pct, year_pct, offenders))
 
 
 def main() -> None:
@@ -192,9 +238,9 @@ def main() -> None:
         print("FINNHUB_API_KEY not set; cannot inspect coverage.", file=sys.stderr)
         sys.exit(1)
 
-    coverage: Dict[str, Dict[int, Dict[str, bool]]] = {}
-    for symbol in SYMBOLS:
-        coverage[symbol] = _collect_symbol_year_metrics(api_key, symbol)
+    # Fetching is network-bound, so overlap the per-symbol round trips
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as pool:
+        coverage = np.stack(list(pool.map(partial(_collect_symbol_year_metrics, api_key), SYMBOLS)))
 
     overall, metric_pct, year_pct, symbol_pct = compute_completeness(coverage)
     missing_by_symbol, _missing_by_year = _build_missing_maps(coverage)
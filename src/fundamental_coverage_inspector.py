@@ -4,12 +4,16 @@ from __future__ import annotations
 import os
 import sys
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
+from itertools import repeat
 from pathlib import Path
-from statistics import mean
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Union
 from urllib.error import URLError
 
+import numpy as np
+
 # Ensure repository root on path for module imports
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -17,13 +21,13 @@ if str(ROOT) not in sys.path:
 
 from buffett_lynch.data_loader import DataLoader, InMemorySource
 from buffett_lynch.universe_builder import UniverseBuilder
-from buffett_lynch.fundamental_scoring import FundamentalScorer, ScoringRules, growth_score, moat_score, quality_score
+from buffett_lynch.fundamental_scoring import make_scorer
 from buffett_lynch.models import FundamentalSnapshot, PriceBar
 from buffett_lynch.config import StrategyConfig, BacktestConfig
 from buffett_lynch.finnhub_fundamentals import FinnhubFundamentalsSource
 
 # Fallback synthetic fundamentals helper from the CI/backtest runner
-from backtester import _fundamentals, _price_series
+from backtester import _fundamentals, _price_series_batch
 
 
 METRICS = [
@@ -41,11 +45,14 @@ METRICS = [
     "r_and_d_to_sales_percentile",
     "roic_trend_percentile",
 ]
+# Bit i of a snapshot's coverage mask is set when METRICS[i] is present
+BITS = {key: 1 << i for i, key in enumerate(METRICS)}
 
 
 @dataclass
 class CoverageResult:
-    coverage: Dict[Tuple[str, str], Dict[str, bool]]
+    # (symbol, period) -> presence bitmask over METRICS (see BITS)
+    coverage: Dict[Tuple[str, str], int]
     symbols: List[str]
     periods: List[str]
 
@@ -64,12 +71,11 @@ def _build_loader(start_date: str, end_date: str) -> Tuple[DataLoader, List[str]
         fundamentals_raw = _fundamentals(tickers, start_year, end_year)
         fundamentals_source = InMemorySource({}, fundamentals_raw, {}, {})
 
-    membership = {"SP500": {str(year): tickers for year in range(start_year, end_year + 1)}}
-    price_history = {
-        symbol: _price_series(symbol, start_date, end_date) for symbol in tickers + [spy_symbol]
-    }
+    years = [str(year) for year in range(start_year, end_year + 1)]
+    membership = {"SP500": dict.fromkeys(years, tickers)}
+    price_history = _price_series_batch(tickers + [spy_symbol], start_date, end_date)
     dates = [bar.date for bar in price_history[spy_symbol]]
-    fx_history = {"USDPLN": [PriceBar(date, 4.0) for date in dates]}
+    fx_history = {"USDPLN": list(map(PriceBar, dates, repeat(4.0)))}
 
     misc_source = InMemorySource(price_history, fundamentals_raw, membership, fx_history)
     loader = DataLoader(
@@ -81,77 +87,104 @@ def _build_loader(start_date: str, end_date: str) -> Tuple[DataLoader, List[str]
     return loader, tickers, fundamentals_raw
 
 
-def _collect_coverage(loader: DataLoader, symbols: List[str]) -> CoverageResult:
-    coverage: Dict[Tuple[str, str], Dict[str, bool]] = {}
+# Per-symbol outcome of a fundamentals load: the snapshots, or the error it raised
+LoadResult = Union[List[FundamentalSnapshot], Exception]
+
+
+def _load_one(loader: DataLoader, symbol: str) -> LoadResult:
+    try:
+        return loader.load_fundamentals(symbol)
+    except Exception as exc:
+        return exc
+
+
+def _load_fundamentals(loader: DataLoader, symbols: List[str]) -> Dict[str, LoadResult]:
+    """Load every symbol once so the scoring and coverage passes share results, failures included."""
+    if not symbols:
+        return {}
+    # The first load builds the loader's shared enrichment; the rest can then fetch concurrently
+    loaded: Dict[str, LoadResult] = {symbols[0]: _load_one(loader, symbols[0])}
+    rest = symbols[1:]
+    with ThreadPoolExecutor(max_workers=min(8, len(rest) or 1)) as pool:
+        loaded.update(zip(rest, pool.map(partial(_load_one, loader), rest)))
+    return loaded
+
+
+def _collect_coverage(loaded: Dict[str, LoadResult], symbols: List[str]) -> CoverageResult:
+    coverage: Dict[Tuple[str, str], int] = {}
     periods: set = set()
 
     for symbol in symbols:
-        try:
-            snapshots = loader.load_fundamentals(symbol)
-        except URLError as exc:
-            print(f"HTTP error for {symbol}: {exc}")
+        snapshots = loaded[symbol]
+        if isinstance(snapshots, URLError):
+            print(f"HTTP error for {symbol}: {snapshots}")
             continue
-        except Exception as exc:  # pragma: no cover - defensive
-            print(f"Error loading fundamentals for {symbol}: {exc}")
+        if isinstance(snapshots, Exception):  # pragma: no cover - defensive
+            print(f"Error loading fundamentals for {symbol}: {snapshots}")
             continue
 
         for snap in snapshots:
             period = str(snap.period)
             periods.add(period)
-            status: Dict[str, bool] = {}
-            for key in METRICS:
-                value = snap.metrics.get(key)
-                status[key] = value is not None
-            coverage[(symbol, period)] = status
+            get = snap.metrics.get
+            mask = 0
+            for key, bit in BITS.items():
+                if get(key) is not None:
+                    mask |= bit
+            coverage[(symbol, period)] = mask
     return CoverageResult(coverage=coverage, symbols=symbols, periods=sorted(periods))
 
 
 def _metric_completeness(result: CoverageResult) -> Dict[str, float]:
-    totals = {key: 0 for key in METRICS}
     total_snaps = len(result.coverage)
     if total_snaps == 0:
         return {key: 0.0 for key in METRICS}
 
-    for snapshot_flags in result.coverage.values():
-        for key, present in snapshot_flags.items():
-            totals[key] += 1 if present else 0
-    return {key: totals[key] / total_snaps * 100.0 for key in METRICS}
+    masks = np.fromiter(result.coverage.values(), dtype=np.uint16, count=total_snaps)
+    counts = ((masks[:, None] >> np.arange(len(METRICS), dtype=np.uint16)) & 1).sum(axis=0)
+    return dict(zip(METRICS, (counts / total_snaps * 100.0).tolist()))
 
 
 def _period_completeness(result: CoverageResult) -> Dict[str, float]:
     if not result.coverage:
         return {}
-    per_period: Dict[str, List[float]] = defaultdict(list)
-    for (symbol, period), flags in result.coverage.items():
-        present = sum(1 for v in flags.values() if v)
-        per_period[period].append(present / len(METRICS) * 100.0)
-    return {period: mean(vals) for period, vals in sorted(per_period.items())}
+    period_index = {period: i for i, period in enumerate(result.periods)}
+    rows = np.fromiter((period_index[period] for _, period in result.coverage), dtype=np.intp, count=len(result.coverage))
+    present = np.fromiter(
+        map(int.bit_count, result.coverage.values()), dtype=np.float64, count=len(result.coverage)
+    )
+    # Per-period mean of the per-snapshot completeness, over the snapshots that exist
+    pct = np.bincount(rows, weights=present) / np.bincount(rows) / len(METRICS) * 100.0
+    return dict(zip(result.periods, pct.tolist()))
 
 
 def _symbol_missing_counts(result: CoverageResult) -> Dict[str, int]:
     counts: Dict[str, int] = defaultdict(int)
-    for (symbol, _), flags in result.coverage.items():
-        missing = len([k for k, v in flags.items() if not v])
-        counts[symbol] += missing
+    for (symbol, _), mask in result.coverage.items():
+        counts[symbol] += len(METRICS) - mask.bit_count()
     return counts
 
 
 def _snapshot_scores(result: CoverageResult) -> List[Tuple[str, str, int]]:
     scores: List[Tuple[str, str, int]] = []
-    for (symbol, period), flags in result.coverage.items():
-        scores.append((symbol, period, sum(1 for v in flags.values() if v)))
+    for (symbol, period), mask in result.coverage.items():
+        scores.append((symbol, period, mask.bit_count()))
     return sorted(scores, key=lambda x: x[2])
 
 
-def _missing_metrics(flags: Dict[str, bool]) -> List[str]:
-    return [k for k, present in flags.items() if not present]
+def _missing_metrics(mask: int) -> List[str]:
+    return [key for key, bit in BITS.items() if not mask & bit]
 
 
-def _print_report(result: CoverageResult) -> None:
+def _snapshot_line(result: CoverageResult, symbol: str, period: str, count: int) -> str:
+    missing = _missing_metrics(result.coverage[(symbol, period)])
+    return f"{symbol} {period}: {count}/{len(METRICS)} present | missing: {', '.join(missing) if missing else 'none'}"
+
+
+def _format_report(result: CoverageResult) -> str:
     total_snaps = len(result.coverage)
     if total_snaps == 0:
-        print("No fundamentals found")
-        return
+        return "No fundamentals found\n"
 
     metrics_pct = _metric_completeness(result)
     period_pct = _period_completeness(result)
@@ -161,39 +194,39 @@ def _print_report(result: CoverageResult) -> None:
     periods_sorted = sorted({p for _, p in result.coverage.keys()})
     period_range = f"{periods_sorted[0]}–{periods_sorted[-1]}" if periods_sorted else "n/a"
 
-    print("================= FUNDAMENTAL COVERAGE REPORT =================")
-    print(f"Snapshots total: {total_snaps}")
-    print(f"Symbols: {len(result.symbols)}")
-    print(f"Periods: {period_range}")
-    print("")
-    print("Metric completeness:")
+    lines = [
+        "================= FUNDAMENTAL COVERAGE REPORT =================",
+        f"Snapshots total: {total_snaps}",
+        f"Symbols: {len(result.symbols)}",
+        f"Periods: {period_range}",
+        "",
+        "Metric completeness:",
+    ]
     for key in METRICS:
         pct = metrics_pct.get(key, 0.0)
         warning = " [WARNING: LOW COVERAGE]" if pct < 60.0 else ""
-        print(f"{key.ljust(30,'.')} {pct:.1f}%{warning}")
-    print("")
-    print("Coverage by period:")
-    for period, pct in period_pct.items():
-        print(f"{period}: {pct:.1f}%")
-    print("")
+        lines.append(f"{key.ljust(30,'.')} {pct:.1f}%{warning}")
+    lines += ["", "Coverage by period:"]
+    lines.extend(f"{period}: {pct:.1f}%" for period, pct in period_pct.items())
+    lines.append("")
     worst_symbols = sorted(missing_counts.items(), key=lambda t: t[1], reverse=True)[:5]
-    print("Worst symbols (most missing fields):")
-    for symbol, missing in worst_symbols:
-        print(f"{symbol}: missing {missing} fields")
-    print("")
+    lines.append("Worst symbols (most missing fields):")
+    lines.extend(f"{symbol}: missing {missing} fields" for symbol, missing in worst_symbols)
+    lines.append("")
 
     best = snapshot_scores[-5:][::-1]
     worst = snapshot_scores[:5]
-    print("Best snapshots:")
-    for symbol, period, count in best:
-        missing = _missing_metrics(result.coverage[(symbol, period)])
-        print(f"{symbol} {period}: {count}/{len(METRICS)} present | missing: {', '.join(missing) if missing else 'none'}")
-    print("")
-    print("Worst snapshots:")
-    for symbol, period, count in worst:
-        missing = _missing_metrics(result.coverage[(symbol, period)])
-        print(f"{symbol} {period}: {count}/{len(METRICS)} present | missing: {', '.join(missing) if missing else 'none'}")
-    print("===============================================================")
+    lines.append("Best snapshots:")
+    lines.extend(_snapshot_line(result, symbol, period, count) for symbol, period, count in best)
+    lines += ["", "Worst snapshots:"]
+    lines.extend(_snapshot_line(result, symbol, period, count) for symbol, period, count in worst)
+    lines.append("===============================================================")
+    return "\n".join(lines) + "\n"
+
+
+def _print_report(result: CoverageResult) -> None:
+    # One write instead of a locked, possibly line-buffered write per line
+    sys.stdout.write(_format_report(result))
 
 
 def main() -> None:
@@ -207,24 +240,20 @@ def main() -> None:
         backtest=BacktestConfig(start_date=start_date, end_date=end_date, base_currency="PLN", initial_capital=100000)
     )
     UniverseBuilder(loader)  # instantiated to mirror backtest setup
-    scorer = FundamentalScorer(
-        ScoringRules(
-            quality=quality_score,
-            value=lambda snap: max(0.0, 100.0 - snap.metrics.get("pe", 0)),
-            growth=growth_score,
-            moat=moat_score,
-            risk=lambda snap: max(0.0, 100.0 - snap.metrics.get("volatility", 0)),
-        )
-    )
+    scorer = make_scorer(strategy_cfg.scoring)
+    loaded = _load_fundamentals(loader, symbols)
     # Trigger scoring to ensure any derived metrics paths remain intact
     for symbol in symbols:
+        snapshots = loaded[symbol]
+        if isinstance(snapshots, Exception):
+            continue
         try:
-            scorer.score(symbol, loader.load_fundamentals(symbol))
+            scorer.score(symbol, snapshots)
         except Exception:
             # Coverage inspection should continue even if scoring fails for a symbol
             continue
 
-    result = _collect_coverage(loader, symbols)
+    result = _collect_coverage(loaded, symbols)
     _print_report(result)
 
 
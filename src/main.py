@@ -1,5 +1,7 @@
 """Entrypoint for running the Buffett/Lynch 2.0 backtest via CLI or CI."""
 
+import argparse
+import os
 from pathlib import Path
 import sys
 
@@ -13,6 +15,16 @@ if str(ROOT) not in sys.path:
 from backtester import run_backtest
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="ignore and do not write the on-disk Yahoo Finance cache (reports/cache)",
+    )
+    args = parser.parse_args()
+    if args.no_cache:
+        os.environ["BL_NO_CACHE"] = "1"
+
     run_backtest(
         start_date="2000-01-01",
         end_date="2025-01-01",
@@ -0,0 +1,67 @@
+"""Parameter sweeps run in worker processes and match sequential runs."""
+
+import threading
+
+import pandas as pd
+
+from buffett_lynch.backtester import Backtester
+from buffett_lynch.config import BacktestConfig, PortfolioConfig, RebalancingConfig
+from buffett_lynch.currency_engine import CurrencyEngine
+from buffett_lynch.data_loader import DataLoader, InMemorySource
+from buffett_lynch.execution_engine import ExecutionEngine
+from buffett_lynch.fundamental_scoring import (
+    FundamentalScorer,
+    ScoringRules,
+    growth_score,
+    moat_score,
+    quality_score,
+    risk_score,
+    value_score,
+)
+from buffett_lynch.models import FundamentalSnapshot, PriceBar
+from buffett_lynch.portfolio_manager import PortfolioManager
+from buffett_lynch.universe_builder import UniverseBuilder
+
+
+class _LockedSource(InMemorySource):
+    """Stands in for network-backed sources such as Finnhub, which hold unpicklable locks."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._lock = threading.Lock()
+
+
+def _make_backtester(top_n: int, loader: DataLoader, scorer: FundamentalScorer) -> Backtester:
+    portfolio_cfg = PortfolioConfig(top_n=top_n, min_value_score=0.0, sma_lookback=5)
+    rebalance_cfg = RebalancingConfig(sma_lookback=5)
+    return Backtester(
+        UniverseBuilder(loader),
+        scorer,
+        PortfolioManager(portfolio_cfg, rebalance_cfg),
+        ExecutionEngine(portfolio_cfg),
+        CurrencyEngine("PLN"),
+        BacktestConfig(initial_capital=1000.0),
+    )
+
+
+def test_run_many_matches_sequential_runs():
+    dates = pd.bdate_range("2020-01-01", "2020-12-31").strftime("%Y-%m-%d").tolist()
+    symbols = ["AAA", "BBB", "CCC"]
+    prices = {
+        symbol: [PriceBar(date, 10.0 + (i + 1) * day * 0.1) for day, date in enumerate(dates)]
+        for i, symbol in enumerate(symbols + ["SHV"])
+    }
+    snapshots = {
+        symbol: [FundamentalSnapshot("2020", 1e9 * (i + 1), "Tech", {"roe": 10.0 + i, "pe": 10.0})]
+        for i, symbol in enumerate(symbols)
+    }
+    source = _LockedSource(prices, snapshots, {"SP500": {"2020": symbols}}, {})
+    loader = DataLoader(source, source, source, source)
+    scorer = FundamentalScorer(ScoringRules(quality_score, value_score, growth_score, moat_score, risk_score))
+    scored = {symbol: scorer.score(symbol, loader.load_fundamentals(symbol)) for symbol in symbols}
+    inputs = (prices["AAA"], prices, scored, {"2020": symbols}, {})
+
+    backtesters = [_make_backtester(top_n, loader, scorer) for top_n in (1, 2)]
+    reports = Backtester.run_many(backtesters, *inputs, max_workers=2)
+
+    assert reports == [bt.run(*inputs) for bt in backtesters]
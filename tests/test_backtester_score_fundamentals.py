@@ -0,0 +1,40 @@
+"""Threaded fundamentals scoring builds the loader's shared enrichment only once."""
+
+import warnings
+
+import backtester as runner
+from buffett_lynch.data_loader import DataLoader, InMemorySource
+from buffett_lynch.fundamental_scoring import make_scorer
+from buffett_lynch.models import FundamentalSnapshot
+
+
+class _CountingSource(InMemorySource):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.all_calls = 0
+
+    def all_fundamentals(self):
+        self.all_calls += 1
+        return super().all_fundamentals()
+
+
+def test_score_fundamentals_enriches_once_and_matches_serial():
+    symbols = [f"S{i:02d}" for i in range(32)]
+    snapshots = {
+        symbol: [
+            FundamentalSnapshot(str(year), 1e9 * (i + 1), "Tech", {"roe": 10.0 + i, "pe": 12.0, "gross_margin_pct": 40.0})
+            for year in (2019, 2020)
+        ]
+        for i, symbol in enumerate(symbols)
+    }
+    source = _CountingSource({}, snapshots, {}, {})
+    scorer = make_scorer()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        scored = runner._score_fundamentals(DataLoader(source, source, source, source), scorer, symbols)
+
+    assert source.all_calls == 1
+    serial_loader = DataLoader(source, source, source, source)
+    assert scored == {symbol: scorer.score_batch(symbol, serial_loader.load_fundamentals(symbol)) for symbol in symbols}
+    assert list(scored) == symbols
@@ -0,0 +1,77 @@
+"""Daily valuation of the backtest portfolio from aligned price matrices."""
+
+import numpy as np
+
+from buffett_lynch.backtester import Backtester
+from buffett_lynch.currency_engine import CurrencyEngine
+from buffett_lynch.models import PriceBar
+
+
+def test_portfolio_values_mark_each_holding_period_to_market():
+    bt = Backtester.__new__(Backtester)
+    price_matrix = np.array(
+        [
+            [10.0, 11.0, 12.0, 13.0],
+            [5.0, 5.0, 6.0, 6.0],
+        ]
+    )
+    segments = [
+        (0, np.array([0.0, 0.0])),
+        (1, np.array([2.0, 0.0])),
+        (3, np.array([0.0, 4.0])),
+    ]
+    capital = np.array([100.0, 78.0, 78.0, 104.0])
+
+    values = bt._portfolio_values(price_matrix, segments, capital)
+
+    assert values.tolist() == [100.0, 100.0, 102.0, 128.0]
+
+
+def test_drawdown_and_sharpe_reduce_equity_arrays():
+    bt = Backtester.__new__(Backtester)
+    equity = np.array([100.0, 120.0, 90.0, 110.0, 60.0])
+
+    assert bt._max_drawdown(equity) == 0.5
+    assert bt._max_drawdown(np.array([])) == 0.0
+    assert bt._sharpe(np.array([0.01, 0.01, 0.01])) == 0.0
+    assert bt._sharpe(np.array([0.02, -0.01])) > 0
+
+
+def test_fx_to_pln_short_circuits_base_and_indexes_pairs():
+    engine = CurrencyEngine("PLN")
+    fx = {"USDPLN": [PriceBar("2020-01-01", 4.0), PriceBar("2020-01-02", 4.1)]}
+    assert engine.fx_to_pln({}, "2020-01-01", "PLN") == 1.0
+    assert engine.fx_to_pln(fx, "2020-01-02", "USD") == 4.1
+    assert engine.fx_to_pln(fx, "2020-01-03", "USD") == 0.0
+    fx["USDPLN"].append(PriceBar("2020-01-03", 4.2))
+    assert engine.fx_to_pln(fx, "2020-01-03", "USD") == 4.2
+
+
+def test_build_aligned_forward_fills_and_buckets_by_currency():
+    engine = CurrencyEngine("PLN")
+    fx = {"USDPLN": [PriceBar("2020-01-02", 4.0), PriceBar("2020-01-04", 4.2)]}
+    dates = ["2020-01-01", "2020-01-02", "2020-01-03", "2020-01-04"]
+    aligned = engine.build_aligned(dates, fx, ["USD", "PLN"])
+    assert aligned["USD"].tolist() == [0.0, 4.0, 4.0, 4.2]
+    assert aligned["PLN"].tolist() == [1.0] * 4
+
+    holdings = {"AAA": 10.0, "BBB": 5.0, "CCC": 2.0}
+    currency_map = {"AAA": "USD", "BBB": "USD", "CCC": "PLN"}
+    assert engine.portfolio_to_pln(holdings, fx, "2020-01-02", currency_map) == 62.0
+    assert engine.portfolio_to_pln(holdings, fx, "2020-01-03", currency_map, fx_today={"USD": 4.0}) == 62.0
+
+
+def test_build_aligned_matches_fx_to_pln_on_unsorted_and_duplicate_dates():
+    engine = CurrencyEngine("PLN")
+    fx = {
+        "USDPLN": [
+            PriceBar("2020-01-03", 4.3),
+            PriceBar("2020-01-01", 4.0),
+            PriceBar("2020-01-02", 4.1),
+            PriceBar("2020-01-02", 9.9),
+        ]
+    }
+    dates = ["2019-12-31", "2020-01-01", "2020-01-02", "2020-01-03"]
+    aligned = engine.build_aligned(dates, fx, ["USD"])
+    assert aligned["USD"].tolist() == [0.0] + [engine.fx_to_pln(fx, date, "USD") for date in dates[1:]]
+    assert aligned["USD"].tolist() == [0.0, 4.0, 4.1, 4.3]
@@ -0,0 +1,92 @@
+"""DataLoader memoizes sorted per-symbol results."""
+
+import numpy as np
+
+from buffett_lynch.data_loader import DataLoader, InMemorySource
+from buffett_lynch.models import FundamentalSnapshot, PriceBar
+
+
+class _CountingSource(InMemorySource):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.calls = 0
+
+    def fundamentals(self, symbol):
+        self.calls += 1
+        return super().fundamentals(symbol)
+
+
+def test_load_fundamentals_sorts_once_per_symbol():
+    snaps = [
+        FundamentalSnapshot("2021", 1e9, "Tech", {"roe": 0.1}),
+        FundamentalSnapshot("2020", 1e9, "Tech", {"roe": 0.2}),
+    ]
+    source = _CountingSource({}, {"AAA": snaps}, {}, {})
+    # Force the per-symbol fallback path by hiding the bulk accessor
+    source.all_fundamentals = lambda: None
+    loader = DataLoader(source, source, source, source)
+
+    first = loader.load_fundamentals("AAA")
+    second = loader.load_fundamentals("AAA")
+
+    assert [s.period for s in first] == ["2020", "2021"]
+    assert second is first
+    assert source.calls == 1
+
+
+def test_price_and_fx_histories_are_sorted_once():
+    bars = [PriceBar("2020-01-02", 2.0), PriceBar("2020-01-01", 1.0)]
+    source = InMemorySource({"AAA": bars}, {}, {}, {"USDPLN": list(bars)})
+    loader = DataLoader(source, source, source, source)
+
+    prices = loader.load_price_history("AAA")
+    fx = loader.load_fx_history("USDPLN")
+
+    assert [b.date for b in prices] == ["2020-01-01", "2020-01-02"]
+    assert loader.load_price_history("AAA") is prices
+    assert [b.close for b in fx] == [1.0, 2.0]
+    assert loader.load_fx_history("USDPLN") is fx
+
+
+def test_load_many_matches_single_symbol_loads():
+    snaps = {"AAA": [FundamentalSnapshot("2020", 1e9, "Tech", {"roe": 0.1})], "BBB": []}
+    prices = {"AAA": [PriceBar("2020-01-02", 2.0), PriceBar("2020-01-01", 1.0)]}
+    source = InMemorySource(prices, snaps, {}, {})
+    loader = DataLoader(source, source, source, source)
+
+    many_prices = loader.load_many_prices(["AAA", "BBB", "AAA"])
+    many_fundamentals = loader.load_many_fundamentals(["AAA", "BBB"])
+
+    assert list(many_prices) == ["AAA", "BBB"]
+    assert many_prices["AAA"] is loader.load_price_history("AAA")
+    assert many_prices["BBB"] == []
+    assert many_fundamentals["AAA"] is loader.load_fundamentals("AAA")
+    assert many_fundamentals["BBB"] == []
+
+
+def test_price_history_soa_is_sorted_and_contiguous():
+    bars = [PriceBar("2020-01-02", 2.0), PriceBar("2020-01-01", 1.0)]
+    source = InMemorySource({"AAA": bars}, {}, {}, {})
+    loader = DataLoader(source, source, source, source)
+
+    dates, closes = loader.load_price_history_soa("AAA")
+
+    assert dates.tolist() == ["2020-01-01", "2020-01-02"]
+    assert closes.dtype == np.float64 and closes.tolist() == [1.0, 2.0]
+    assert loader.load_price_history_soa("AAA")[1] is closes
+
+
+def test_fundamental_panel_is_cached_per_index_year_and_read_only():
+    fundamentals = {
+        "AAA": [FundamentalSnapshot("2020", 2e9, "Tech", {"roe": 0.1})],
+        "BBB": [FundamentalSnapshot("2021", 3e9, "Energy", {"roe": 0.2})],
+    }
+    source = InMemorySource({}, fundamentals, {"SP500": {"2020": ["AAA", "BBB"]}}, {})
+    loader = DataLoader(source, source, source, source)
+
+    panel = loader.load_fundamental_panel("SP500", "2020")
+
+    assert loader.load_fundamental_panel("SP500", "2020") is panel
+    assert panel.symbols.tolist() == ["AAA"]
+    assert not panel.market_caps.flags.writeable
+    assert not panel.metrics["roe"].flags.writeable
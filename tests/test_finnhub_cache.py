@@ -0,0 +1,27 @@
+"""File cache for raw Finnhub responses used by the coverage inspector."""
+
+from finnhub_cache import FileCache
+
+
+def test_round_trip_and_expiry(tmp_path, monkeypatch):
+    monkeypatch.delenv("BL_NO_CACHE", raising=False)
+    cache = FileCache(tmp_path / "finnhub")
+    key = cache.key("/stock/metric", {"symbol": "AAPL", "metric": "all"})
+
+    assert cache.get(key) is None
+    cache.set(key, {"metric": {"marketCapitalization": 1.0}})
+    assert cache.get(key) == {"metric": {"marketCapitalization": 1.0}}
+    # Parameter order does not change the key
+    assert cache.key("/stock/metric", {"metric": "all", "symbol": "AAPL"}) == key
+
+    cache.set(key, {"stale": True}, ttl=-1)
+    assert cache.get(key) is None
+
+
+def test_no_cache_env_disables_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("BL_NO_CACHE", "1")
+    cache = FileCache(tmp_path)
+    cache.set("k", {"a": 1})
+
+    assert cache.get("k") is None
+    assert not any(tmp_path.iterdir())
@@ -0,0 +1,85 @@
+"""Finnhub source: fetching, snapshot building and the on-disk cache."""
+
+import json
+
+from buffett_lynch.finnhub_fundamentals import FinnhubFundamentalsSource
+
+
+def _financials(symbol):
+    return {
+        "data": [
+            {"year": 2020, "report": {"ic": {"revenue": 100.0, "grossProfit": 40.0}}},
+            {"year": 2021, "report": {"ic": {"revenue": 120.0, "grossProfit": 50.0}}},
+        ]
+    }
+
+
+def _metrics(symbol):
+    return {"metric": {"marketCapitalization": 1000.0, "sector": "Tech", "beta": 1.5}, "series": {"annual": {}}}
+
+
+def _source(tmp_path, monkeypatch, symbols):
+    source = FinnhubFundamentalsSource("token", symbols=symbols, cache_dir=tmp_path)
+    calls = []
+    monkeypatch.setattr(source, "_fetch_financials", lambda s: calls.append(s) or _financials(s))
+    monkeypatch.setattr(source, "_fetch_metrics", _metrics)
+    return source, calls
+
+
+def test_all_fundamentals_fetches_each_symbol_once_in_order(tmp_path, monkeypatch):
+    symbols = [f"S{i}" for i in range(20)]
+    source, calls = _source(tmp_path, monkeypatch, symbols)
+
+    result = source.all_fundamentals()
+
+    assert list(result) == symbols
+    assert sorted(calls) == sorted(symbols)
+    snap = result["S3"][-1]
+    assert snap.period == "2021"
+    assert snap.metrics["growth"] == 20.0
+    assert snap.metrics["volatility"] == 30.0
+
+    # A fresh instance is served from the disk cache without fetching
+    cached, cached_calls = _source(tmp_path, monkeypatch, symbols)
+    reloaded = cached.all_fundamentals()
+    assert reloaded["S3"][-1].metrics == snap.metrics
+    assert cached_calls == []
+    # Decoded metric names and sectors are interned, so every snapshot shares one copy
+    key_a = next(iter(reloaded["S3"][-1].metrics))
+    key_b = next(iter(reloaded["S4"][-1].metrics))
+    assert key_a is key_b
+    assert reloaded["S3"][-1].sector is reloaded["S4"][-1].sector
+
+
+def test_legacy_json_cache_is_moved_into_the_store(tmp_path, monkeypatch):
+    legacy = {"snapshots": [{"period": "2019", "market_cap": 5.0, "sector": "Energy", "metrics": {"roe": 12.0}}]}
+    (tmp_path / "OLD_fundamentals.json").write_text(json.dumps(legacy))
+    source, calls = _source(tmp_path, monkeypatch, ["OLD"])
+
+    snaps = source.all_fundamentals()["OLD"]
+
+    assert [(s.period, s.sector, s.metrics) for s in snaps] == [("2019", "Energy", {"roe": 12.0})]
+    assert calls == []
+    assert source._load_cache_many(["OLD"])["OLD"][0].metrics == {"roe": 12.0}
+
+
+def test_growth_and_revenue_volatility_penalty(tmp_path):
+    source = FinnhubFundamentalsSource("token", cache_dir=tmp_path)
+    reports = [{"year": year, "report": {"ic": {"revenue": revenue}}} for year, revenue in
+               [(2019, 100.0), (2020, 120.0), (2021, 150.0)]]
+
+    snaps = source._build_snapshots("AAA", {"data": reports}, {})
+
+    assert [s.metrics.get("growth") for s in snaps] == [None, 20.0, 25.0]
+    assert abs(snaps[0].metrics["revenue_volatility_penalty"] - 12.5 ** 0.5) < 1e-12
+
+
+def test_roic_history_is_the_series_prefix_up_to_each_period(tmp_path):
+    source = FinnhubFundamentalsSource("token", cache_dir=tmp_path)
+    reports = [{"year": year, "report": {}} for year in (2018, 2020, 2021)]
+    series = {"annual": {"roic": [{"period": f"{y}-12-31", "v": v} for y, v in
+                                  [(2017, 1.0), (2019, 2.0), (2020, 3.0), (2022, 4.0)]]}}
+
+    snaps = source._build_snapshots("AAA", {"data": reports}, {"metric": {}, "series": series})
+
+    assert [s.metrics.get("roic_history") for s in snaps] == [[1.0], [1.0, 2.0, 3.0], [1.0, 2.0, 3.0]]
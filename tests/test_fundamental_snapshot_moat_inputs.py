@@ -1,15 +1,9 @@
 """Ensure FundamentalSnapshot construction includes moat percentile metrics."""
 
-import sys
 import types
-from pathlib import Path
 
 import numpy as np
 
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
-if str(PROJECT_ROOT) not in sys.path:
-    sys.path.insert(0, str(PROJECT_ROOT))
-
 import backtester as runner
 from buffett_lynch.data_loader import DataLoader, InMemorySource
 
@@ -55,6 +49,8 @@ def test_moat_percentiles_populated(monkeypatch):
     }
 
     monkeypatch.setattr(runner, "yf", _stub_yf(fundamentals_data))
+    monkeypatch.setenv("BL_NO_CACHE", "1")
+    runner._ticker_info.cache_clear()
 
     raw_fundamentals = runner._fundamentals(list(fundamentals_data.keys()), 2020, 2020)
     source = InMemorySource({}, raw_fundamentals, {}, {})
@@ -80,3 +76,18 @@ def test_moat_percentiles_populated(monkeypatch):
     for values in percentiles.values():
         assert all(0.0 <= v <= 100.0 for v in values)
         assert len(set(np.round(values, 6))) > 1
+
+
+def test_failed_info_scrape_is_not_cached(monkeypatch, tmp_path):
+    monkeypatch.delenv("BL_NO_CACHE", raising=False)
+    monkeypatch.setenv("BL_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(runner, "yf", _stub_yf({"AAA": {"marketCap": 1e11}}))
+    runner._ticker_info.cache_clear()
+
+    # BBB's empty payload forces default values, so that call must not be persisted
+    runner._fundamentals(["AAA", "BBB"], 2020, 2020)
+    assert not list(tmp_path.glob("*.pkl"))
+
+    runner._fundamentals(["AAA"], 2020, 2020)
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+    runner._ticker_info.cache_clear()
@@ -0,0 +1,41 @@
+"""Order generation on rebalance dates."""
+
+from buffett_lynch.config import PortfolioConfig
+from buffett_lynch.execution_engine import ExecutionEngine
+from buffett_lynch.models import Position, ScoredCompany
+
+
+def _pick(symbol: str, total: float, value: float = 50.0) -> ScoredCompany:
+    return ScoredCompany(symbol, 80.0, value, 60.0, 55.0, 10.0, total, "Tech", 1e9)
+
+
+def _orders(engine, picks, top100, portfolio):
+    symbols = {p.symbol for p in picks} | set(portfolio)
+    return engine.generate_orders(
+        date="2020-03-31",
+        picks=picks,
+        top100=top100,
+        spy_regime="bull",
+        price_map={s: 100.0 for s in symbols},
+        sma_map={s: {"2020-03-31": 90.0} for s in symbols},
+        portfolio=portfolio,
+    )
+
+
+def test_rebalances_with_the_same_picks_reuse_the_ranking():
+    engine = ExecutionEngine(PortfolioConfig(top_n=1, hold_multiplier=2))
+    picks = [_pick("AAA", 1.0), _pick("BBB", 3.0), _pick("CCC", 2.0), _pick("DDD", 5.0)]
+    top100 = ["AAA", "BBB", "CCC"]
+    portfolio = {"AAA": Position("AAA", 1.0, "USD", 0.5, 100.0)}
+
+    first = _orders(engine, picks, top100, portfolio)
+    ranking = engine._ranking_memo[3]
+    second = _orders(engine, picks, top100, portfolio)
+
+    assert [(o.symbol, o.action, o.reason) for o in first] == [
+        ("AAA", "SELL", "Below TOP3N buffer"),
+        ("BBB", "BUY", "Enter TOP15"),
+    ]
+    assert second == first
+    assert engine._ranking_memo[3] is ranking
+    assert [p.symbol for p in ranking[0]] == ["BBB", "CCC"]
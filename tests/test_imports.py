@@ -1,13 +1,4 @@
 import importlib
-import sys
-from pathlib import Path
-
-import pytest
-
-# Ensure project root is on sys.path for package imports
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
-if str(PROJECT_ROOT) not in sys.path:
-    sys.path.insert(0, str(PROJECT_ROOT))
 
 MODULES = [
     "backtester",
@@ -24,7 +15,12 @@ MODULES = [
 ]
 
 
-@pytest.mark.parametrize("module", MODULES)
-def test_module_imports(module: str) -> None:
+def test_module_imports() -> None:
     """Ensure strategy modules can be imported without side effects."""
-    importlib.import_module(f"buffett_lynch.{module}")
+    failed = []
+    for module in MODULES:
+        try:
+            importlib.import_module(f"buffett_lynch.{module}")
+        except Exception as exc:  # report every broken module, not just the first
+            failed.append(f"{module}: {exc!r}")
+    assert not failed, "\n".join(failed)
@@ -0,0 +1,56 @@
+"""Raw moat inputs and their yearly percentiles."""
+
+import copy
+
+from buffett_lynch.fundamental_metrics import FundamentalMetrics
+from buffett_lynch.fundamental_raw_metrics import FundamentalRawMetrics, _linear_trend
+from buffett_lynch.models import FundamentalSnapshot
+
+
+def _universe():
+    return {
+        "AAA": [FundamentalSnapshot("2020", 1e9, "Tech", {"revenue": 100.0, "gross_profit": 60.0,
+                                                         "roic_history": [5.0, 6.0, 7.0]})],
+        "BBB": [FundamentalSnapshot("2020", 1e9, "Tech", {"revenue": 100.0, "gross_profit": 30.0,
+                                                         "r_and_d_expense": 10.0})],
+    }
+
+
+def test_inplace_enrichment_matches_copying_enrichment():
+    source = _universe()
+    copied = FundamentalMetrics().enrich_moat_percentiles(FundamentalRawMetrics().enrich_moat_raw_metrics(source))
+    assert "gross_margin_pct" not in source["AAA"][0].metrics
+
+    inplace_source = copy.deepcopy(source)
+    raw = FundamentalRawMetrics().enrich_moat_raw_metrics(inplace_source, inplace=True)
+    result = FundamentalMetrics().enrich_moat_percentiles(raw, inplace=True)
+
+    assert result["AAA"] is inplace_source["AAA"]
+    for symbol, snaps in copied.items():
+        assert [s.metrics for s in result[symbol]] == [s.metrics for s in snaps]
+    assert result["AAA"][0].metrics["gross_margin_pct"] == 60.0
+    assert result["AAA"][0].metrics["gross_margin_percentile"] == 100.0
+    assert result["BBB"][0].metrics["gross_margin_percentile"] == 50.0
+
+
+def test_linear_trend_matches_least_squares_slope():
+    assert _linear_trend([7.0]) == 0.0
+    assert _linear_trend([1.0, 2.0]) == 1.0
+    assert abs(_linear_trend([10.0, 12.5, 11.0, 9.0, 15.0]) - 0.65) < 1e-12
+
+
+def test_sales_ratios_skip_missing_inputs_and_zero_revenue():
+    universe = {
+        "AAA": [
+            FundamentalSnapshot("2019", 1e9, "Tech", {"revenue": 0.0, "gross_profit": 5.0}),
+            FundamentalSnapshot("2020", 1e9, "Tech", {"revenue": 200.0, "r_and_d_expense": 20.0}),
+        ],
+        "BBB": [FundamentalSnapshot("2020", 1e9, "Tech", {"gross_profit": 5.0, "revenue": None})],
+    }
+
+    enriched = FundamentalRawMetrics().enrich_moat_raw_metrics(universe)
+
+    first, second = (s.metrics for s in enriched["AAA"])
+    assert "gross_margin_pct" not in first and "rd_sales_pct" not in first
+    assert "gross_margin_pct" not in second and second["rd_sales_pct"] == 10.0
+    assert "gross_margin_pct" not in enriched["BBB"][0].metrics
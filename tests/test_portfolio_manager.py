@@ -0,0 +1,53 @@
+"""PortfolioManager constraint, ranking, and rebalance behaviour."""
+
+import pytest
+
+from buffett_lynch.config import PortfolioConfig, RebalancingConfig
+from buffett_lynch.models import Order, Position, ScoredCompany
+from buffett_lynch.portfolio_manager import PortfolioManager
+
+
+def _company(symbol: str, quality: float = 1.0, sector: str = "Tech", total: float = 0.0) -> ScoredCompany:
+    return ScoredCompany(symbol, quality, 50.0, 50.0, 50.0, 10.0, total, sector, 1e9)
+
+
+def test_sector_cap_scales_only_the_overweight_sector():
+    pm = PortfolioManager(
+        PortfolioConfig(),
+        RebalancingConfig(min_position=0.0, max_position=1.0, max_sector_weight=0.4),
+    )
+    picks = [_company("A", 3.0), _company("B", 3.0), _company("C", 2.0, "Energy"), _company("D", 2.0, "Health")]
+
+    weights = {a.symbol: a.weight for a in pm.build_weights(picks)}
+
+    # Tech (0.6) is scaled to 0.4, then everything is renormalized by 0.8
+    assert weights["A"] == pytest.approx(0.25)
+    assert weights["B"] == pytest.approx(0.25)
+    assert weights["C"] == pytest.approx(0.25)
+    assert sum(weights.values()) == pytest.approx(1.0)
+
+
+def test_rebalance_orders_skips_unpriced_and_unchanged_targets():
+    pm = PortfolioManager(PortfolioConfig(), RebalancingConfig())
+    targets = pm.build_weights([_company("A"), _company("B", sector="Energy"), _company("C", sector="Health")])
+    current = {
+        "B": Position("B", 1.0, "USD", targets[1].weight, 1.0),
+        "OLD": Position("OLD", 3.0, "USD", 0.1, 1.0),
+    }
+
+    orders = pm.rebalance_orders(current, targets, {"A": 2.0, "B": 5.0}, "USD")
+
+    assert orders == [
+        Order("OLD", "SELL", 3.0, "USD", reason="Removed from target"),
+        Order("A", "BUY", targets[0].weight / 2.0, "USD", reason="Rebalance", price=2.0),
+    ]
+
+
+def test_pick_top_matches_stable_descending_sort():
+    pm = PortfolioManager(PortfolioConfig(top_n=4), RebalancingConfig())
+    scored = [_company(f"S{i}", total=float(i % 3)) for i in range(10)]
+
+    picks = pm.pick_top(scored)
+
+    assert [p.symbol for p in picks] == ["S2", "S5", "S8", "S1"]
+    assert pm.pick_top(scored[:2]) == [scored[1], scored[0]]
@@ -0,0 +1,92 @@
+"""Batched Yahoo Finance downloads: per-symbol split, fallback, and disk cache."""
+
+import types
+
+import numpy as np
+import pandas as pd
+
+import backtester as runner
+
+
+def _stub_download(frame, calls):
+    def download(tickers, **kwargs):
+        calls.append(list(tickers))
+        return frame
+
+    return types.SimpleNamespace(download=download)
+
+
+def test_batch_download_splits_symbols_and_falls_back(monkeypatch):
+    dates = pd.to_datetime(["2020-01-02", "2020-01-03", "2020-01-06"])
+    columns = pd.MultiIndex.from_product([["AAA", "BBB"], ["Open", "Close"]])
+    frame = pd.DataFrame(
+        [
+            [1.0, 10.0, 2.0, np.nan],
+            [1.0, 11.0, 2.0, 21.0],
+            [1.0, 12.0, 2.0, 22.0],
+        ],
+        index=dates,
+        columns=columns,
+    )
+    calls = []
+    monkeypatch.setattr(runner, "yf", _stub_download(frame, calls))
+    monkeypatch.setenv("BL_NO_CACHE", "1")
+
+    history = runner._price_series_batch(["AAA", "BBB", "ZZZ"], "2020-01-01", "2020-01-07")
+
+    assert calls == [["AAA", "BBB", "ZZZ"]]
+    assert [(b.date, b.close) for b in history["AAA"]] == [
+        ("2020-01-02", 10.0),
+        ("2020-01-03", 11.0),
+        ("2020-01-06", 12.0),
+    ]
+    # Rows where a ticker did not trade are dropped rather than reported as NaN.
+    assert [b.date for b in history["BBB"]] == ["2020-01-03", "2020-01-06"]
+    # Missing tickers use the deterministic linear fallback.
+    assert history["ZZZ"][0].close == 100.0
+    assert history["ZZZ"][-1].close == 120.0
+
+
+def test_batch_download_is_cached_on_disk(monkeypatch, tmp_path):
+    dates = pd.to_datetime(["2020-01-02"])
+    frame = pd.DataFrame({("AAA", "Close"): [10.0]}, index=dates)
+    calls = []
+    monkeypatch.setattr(runner, "yf", _stub_download(frame, calls))
+    monkeypatch.delenv("BL_NO_CACHE", raising=False)
+    monkeypatch.setenv("BL_CACHE_DIR", str(tmp_path))
+
+    first = runner._price_series_batch(["AAA"], "2020-01-01", "2020-01-03")
+    second = runner._price_series_batch(["AAA"], "2020-01-01", "2020-01-03")
+
+    assert calls == [["AAA"]]
+    assert second == first
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+
+
+def test_fallback_results_are_not_cached(monkeypatch, tmp_path):
+    dates = pd.to_datetime(["2020-01-02"])
+    frame = pd.DataFrame({("AAA", "Close"): [10.0]}, index=dates)
+    calls = []
+    monkeypatch.setattr(runner, "yf", _stub_download(frame, calls))
+    monkeypatch.delenv("BL_NO_CACHE", raising=False)
+    monkeypatch.setenv("BL_CACHE_DIR", str(tmp_path))
+
+    # ZZZ is missing from the download, so the result carries synthetic prices
+    runner._price_series_batch(["AAA", "ZZZ"], "2020-01-01", "2020-01-03")
+    runner._price_series_batch(["AAA", "ZZZ"], "2020-01-01", "2020-01-03")
+
+    assert len(calls) == 2
+    assert not list(tmp_path.glob("*.pkl"))
+
+
+def test_price_frame_is_tidy(monkeypatch):
+    dates = pd.to_datetime(["2020-01-02", "2020-01-03"])
+    frame = pd.DataFrame({("AAA", "Close"): [10.0, 11.0], ("BBB", "Close"): [20.0, 21.0]}, index=dates)
+    monkeypatch.setattr(runner, "yf", _stub_download(frame, []))
+    monkeypatch.setenv("BL_NO_CACHE", "1")
+
+    prices = runner._price_frame(["AAA", "BBB"], "2020-01-01", "2020-01-04")
+
+    assert list(prices.columns) == ["symbol", "date", "close"]
+    assert prices["symbol"].tolist() == ["AAA", "AAA", "BBB", "BBB"]
+    assert prices["close"].tolist() == [10.0, 11.0, 20.0, 21.0]
@@ -0,0 +1,19 @@
+"""top_indices matches a stable descending sort truncated to n."""
+
+import numpy as np
+
+from buffett_lynch.ranking import top_indices
+
+
+def test_top_indices_matches_stable_sort_with_ties():
+    values = np.array([3.0, 1.0, 3.0, 2.0, 3.0, 0.5])
+    expected = sorted(range(len(values)), key=values.__getitem__, reverse=True)
+    for n in range(len(values) + 2):
+        assert top_indices(values, n).tolist() == expected[:n]
+
+
+def test_top_indices_non_positive_n_is_empty():
+    values = np.array([1.0, 2.0])
+    assert top_indices(values, 0).tolist() == []
+    assert top_indices(values, -3).tolist() == []
+    assert top_indices(np.array([]), 0).tolist() == []
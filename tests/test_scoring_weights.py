@@ -1,13 +1,17 @@
 """Unit tests for Buffett/Lynch scoring weights and moat component."""
 
+from buffett_lynch.config import ScoringConfig
 from buffett_lynch.fundamental_scoring import (
     FundamentalScorer,
     ScoringRules,
     growth_score,
+    make_scorer,
     moat_score,
     quality_score,
+    risk_score,
+    value_score,
 )
-from buffett_lynch.models import FundamentalSnapshot
+from buffett_lynch.models import FundamentalPanel, FundamentalSnapshot
 
 
 def test_total_score_weights_include_moat_component():
@@ -116,3 +120,108 @@ def test_growth_score_penalizes_revenue_volatility():
 
     assert growth_score(snap) == 37.5
 
+
+def test_value_and_risk_scores_invert_pe_and_volatility():
+    """ValueScore/RiskScore are 100 minus P/E and volatility, floored at zero."""
+
+    snap = FundamentalSnapshot(
+        period="2024",
+        market_cap=1_000_000_000,
+        sector="Tech",
+        metrics={"pe": 25.0, "volatility": 130.0},
+    )
+
+    assert value_score(snap) == 75.0
+    assert risk_score(snap) == 0.0
+
+
+def test_score_batch_matches_per_snapshot_scoring():
+    """The array path must reproduce the callable path for the built-in rules."""
+
+    snaps = [
+        FundamentalSnapshot(
+            period=str(2020 + i),
+            market_cap=1_000_000_000 + i,
+            sector="Tech",
+            metrics={
+                "growth": 10.0 * i,
+                "revenue_volatility_penalty": 15.0,
+                "roe": 3.5 * i,
+                "roic_trend_pct": 70.0 - i,
+                "gross_margin_percentile": 0.8,
+                "rd_sales_pct": None,
+                "pe": 20.0 * i,
+                "volatility": 1.2,
+            },
+        )
+        for i in range(8)
+    ]
+    # Explicit gaps: None and NaN both fall back like an absent key on either path
+    snaps += [
+        FundamentalSnapshot("2028", 1.0, "Tech", {"roe": float("nan"), "pe": 10.0}),
+        FundamentalSnapshot("2029", 1.0, "Tech", {"growth": None, "pe": None, "volatility": float("nan")}),
+        FundamentalSnapshot(
+            "2030", 1.0, "Tech", {"gross_margin_percentile": float("nan"), "gross_margin_pct": 0.7, "rd_sales_pct": None}
+        ),
+    ]
+    scorer = FundamentalScorer(
+        ScoringRules(
+            quality=quality_score,
+            value=value_score,
+            growth=growth_score,
+            moat=moat_score,
+            risk=risk_score,
+        )
+    )
+
+    scored = scorer.score("ABC", snaps)
+    assert scorer.score_batch("ABC", snaps) == scored
+    assert all(company.total == company.total for company in scored)
+    assert scorer.score_batch("ABC", []) == []
+
+
+def test_score_batch_ignores_list_valued_metrics():
+    # Finnhub snapshots carry ROIC history prefixes that grow by one entry per year
+    snaps = [
+        FundamentalSnapshot(str(2020 + i), 1.0, "Tech", {"roe": 10.0 + i, "pe": 12.0, "roic_history": [8.0] * (i + 1)})
+        for i in range(3)
+    ]
+    scorer = make_scorer()
+
+    assert scorer.score_batch("ABC", snaps) == scorer.score("ABC", snaps)
+    assert "roic_history" not in FundamentalPanel.from_snapshots(snaps, "ABC").metrics
+
+
+def test_fundamental_panel_columns_fall_back_in_key_order():
+    snaps = [
+        FundamentalSnapshot("2023", 1.0, "Tech", {"a": 1.0, "b": 2.0}),
+        FundamentalSnapshot("2023", 2.0, "Tech", {"a": None, "b": 3.0}),
+        FundamentalSnapshot("2023", 3.0, "Energy", {}),
+    ]
+    panel = FundamentalPanel.from_snapshots(snaps, ["X", "Y", "Z"])
+
+    assert len(panel) == 3
+    assert panel.symbols.tolist() == ["X", "Y", "Z"]
+    assert panel.column("a", "b", default=0.5).tolist() == [1.0, 3.0, 0.5]
+    assert panel.column("missing").tolist() == [0.0, 0.0, 0.0]
+
+
+def test_custom_total_weights_apply_to_both_paths():
+    snap = FundamentalSnapshot("2024", 1.0, "Tech", {"roe": 50.0, "pe": 30.0, "volatility": 20.0})
+    rules = ScoringRules(
+        quality=quality_score, value=value_score, growth=growth_score, moat=moat_score, risk=risk_score
+    )
+    scorer = FundamentalScorer(rules, weights=[1.0, 0.0, 0.0, 0.0, 0.0])
+
+    assert scorer.score("ABC", [snap])[0].total == 45.0
+    assert scorer.score_batch("ABC", [snap])[0].total == 45.0
+
+
+def test_make_scorer_reads_weights_from_config():
+    snap = FundamentalSnapshot("2024", 1.0, "Tech", {"roe": 50.0, "pe": 30.0, "volatility": 20.0})
+
+    default = make_scorer().score("ABC", [snap])[0]
+    quality_only = make_scorer(ScoringConfig(1.0, 0.0, 0.0, 0.0, 0.0)).score("ABC", [snap])[0]
+
+    assert default == make_scorer(ScoringConfig()).score("ABC", [snap])[0]
+    assert quality_only.total == 45.0
@@ -0,0 +1,52 @@
+"""Simple moving averages used for trend and regime filters."""
+
+import numpy as np
+
+from buffett_lynch.config import PortfolioConfig
+from buffett_lynch.execution_engine import ExecutionEngine, sma
+from buffett_lynch.models import PriceBar
+
+
+def _naive_sma(prices, lookback):
+    return {
+        prices[i].date: sum(bar.close for bar in prices[i - lookback + 1 : i + 1]) / lookback
+        for i in range(lookback - 1, len(prices))
+    }
+
+
+def test_sma_matches_trailing_window_mean():
+    rng = np.random.default_rng(7)
+    closes = 100 + rng.normal(0, 1, 300).cumsum()
+    prices = [PriceBar(f"d{i:04d}", float(c)) for i, c in enumerate(closes)]
+
+    result = sma(prices, 20)
+    expected = _naive_sma(prices, 20)
+
+    assert list(result) == list(expected)
+    assert np.allclose(list(result.values()), list(expected.values()), rtol=1e-12)
+    assert sma(prices[:5], 20) == {}
+
+
+def test_sma_stays_exact_on_long_flat_histories():
+    prices = [PriceBar(f"d{i:05d}", 4321.123) for i in range(20000)]
+
+    values = set(sma(prices, 200).values())
+
+    assert values == {4321.123}
+
+
+def test_bull_bear_labels_closes_against_their_sma():
+    closes = [10.0, 10.0, 10.0, 12.0, 9.0, 10.0]
+    prices = [PriceBar(f"d{i}", c) for i, c in enumerate(closes)]
+    engine = ExecutionEngine(PortfolioConfig(sma_lookback=3))
+
+    regime = engine.bull_bear(prices)
+
+    assert regime == {"d2": "bull", "d3": "bull", "d4": "bear", "d5": "bear"}
+    assert ExecutionEngine(PortfolioConfig(sma_lookback=10)).bull_bear(prices) == {}
+
+
+def test_sma_can_be_restricted_to_requested_dates():
+    prices = [PriceBar(f"d{i}", float(i)) for i in range(6)]
+
+    assert sma(prices, 2, only_dates={"d0", "d3", "d5"}) == {"d3": 2.5, "d5": 4.5}
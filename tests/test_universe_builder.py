@@ -0,0 +1,38 @@
+"""UniverseBuilder picks the yearly top-100 by market cap."""
+
+from buffett_lynch.data_loader import DataLoader, InMemorySource
+from buffett_lynch.models import FundamentalSnapshot
+from buffett_lynch.universe_builder import UniverseBuilder
+
+
+def test_top_market_cap_uses_latest_snapshot_per_year_and_stable_ties():
+    fundamentals = {
+        f"S{i:03d}": [FundamentalSnapshot("2020", float(i % 7), "Tech", {})] for i in range(150)
+    }
+    # A later duplicate period overrides the earlier snapshot
+    fundamentals["S000"].append(FundamentalSnapshot("2020", 1e12, "Tech", {}))
+    symbols = list(fundamentals) + ["MISSING"]
+    source = InMemorySource({}, fundamentals, {"SP500": {"2020": symbols}}, {})
+    loader = DataLoader(source, source, source, source)
+
+    top = UniverseBuilder(loader).build_top_market_cap("SP500")["2020"]
+
+    ranked = sorted(
+        ((s, fundamentals[s][-1].market_cap) for s in symbols if s in fundamentals),
+        key=lambda t: t[1],
+        reverse=True,
+    )
+    assert top == [s for s, _ in ranked[:100]]
+    assert top[0] == "S000"
+
+
+def test_top_market_cap_tolerates_list_valued_metrics():
+    # Finnhub-shaped snapshots: ROIC history prefixes differ in length across members
+    fundamentals = {
+        "AAA": [FundamentalSnapshot("2020", 5.0, "Tech", {"roe": 10.0, "roic_history": [8.0]})],
+        "BBB": [FundamentalSnapshot("2020", 9.0, "Tech", {"roe": 12.0, "roic_history": [7.0, 9.0]})],
+    }
+    source = InMemorySource({}, fundamentals, {"SP500": {"2020": ["AAA", "BBB"]}}, {})
+    loader = DataLoader(source, source, source, source)
+
+    assert UniverseBuilder(loader).build_top_market_cap("SP500") == {"2020": ["BBB", "AAA"]}